@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 #
 # Scanning script for the Noisebridge book scanner with Flask web server.
-import glob
+import bisect
+import io
 import json
+import logging
 import os
+import queue
 import re
 import select
 import shutil
@@ -12,22 +15,69 @@ import sys
 import termios
 import time
 import tty
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Thread
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Barrier, BrokenBarrierError, Event, Lock, Thread, Timer
 
 from flask import Flask, jsonify, render_template, request, send_file
 from flask_socketio import SocketIO, emit
-from PIL import Image, ImageDraw
-from PIL.ExifTags import TAGS
+from PIL import Image
+
+from process import (
+    _crop_worker,
+    _write_text_replacing,
+    get_upright_size,
+    preview_crop,
+    rotate_jpeg,
+    scan_jpeg_header,
+    tag_jpeg_rotation,
+)
 
 # Get the directory where scan.py is located (for templates/static)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-GPHOTO = "gphoto2"
+# Resolved to a full path so subprocess can launch it with posix_spawn
+GPHOTO = shutil.which("gphoto2") or "gphoto2"
 IMG_FORMAT = "img%05d.jpg"
 TMP_FORMAT = "tmp%05d.jpg"
 PORT = 5001
 CAPTURE_KEY = "b"  # Key for foot pedal capture
+CAPTURE_TIMEOUT = 30  # Seconds to wait for a capture-and-download to finish
+METADATA_CHECKPOINT_PAGES = 10  # Save progress to scan_metadata.json this often
+CAPTURE_SYNC_TIMEOUT = 2  # Seconds a paired capture waits for the other camera
+# Rotate captures by rewriting their EXIF Orientation instead of their
+# pixels (SCANNER_EXIF_ROTATION=1). process.py applies the rotation for real
+# before cropping or building a PDF, but other tools reading the raw
+# captures must honour EXIF
+EXIF_ONLY_ROTATION = bool(os.environ.get("SCANNER_EXIF_ROTATION"))
+
+# Camera ports in `gphoto2 --auto-detect` output
+USB_PORT = re.compile(r"usb:\d*,\d*")
+
+# Battery level in `--get-config /main/status/batterylevel` output, as a
+# percentage ("Current: 67%") or as text ("Current: Full")
+BATTERY_PERCENT = re.compile(r"Current:\s*(\d+)%?")
+BATTERY_TEXT = re.compile(r"Current:\s*(.+)")
+
+# Fields read from `gphoto2 --summary`, and the camera info keys they fill
+SUMMARY_FIELD = re.compile(r"(Model|Manufacturer|Serial Number):\s+(.+)")
+SUMMARY_KEYS = {"Model": "model", "Manufacturer": "manufacturer", "Serial Number": "serial"}
+
+# Where a capture-image (no download) left the new file on the camera card
+CARD_FILE = re.compile(r"New file is in location (\S+) on the camera")
+
+# Prompt printed by `gphoto2 --shell` when it's ready for the next command,
+# e.g. "gphoto2: {/home/scanner/captures/...} /> "
+SHELL_PROMPT = re.compile(rb"gphoto2: \{[^}]*\}[^\n]*> $")
+
+# Capture-loop progress. Per-capture detail (ports, commands, each step) is
+# logged at DEBUG so a normal session prints about one line per page
+logger = logging.getLogger("scanner")
+
+# Shown at INFO after every page. It never changes, so it's encoded once
+# here and written with write_cue() instead of going through the logger
+READY_CUE = b"Ready.\n\n"
 
 # Global state for the web server
 scanner_state = {
@@ -37,11 +87,13 @@ scanner_state = {
     "right_cam_serial": "",
     "left_cam_battery": None,
     "right_cam_battery": None,
-    "images": [],
+    "images": [],  # Sorted image filenames
+    "images_set": set(),  # The same filenames, for membership checks
     "status_color": "fff",
     "status_text": "Initializing...",
     "left_cam_locked": False,  # Track if we've locked the left camera
     "right_cam_locked": False,  # Track if we've locked the right camera
+    "rev": 0,  # Bumped whenever the gallery's images change
 }
 
 app = Flask(
@@ -49,12 +101,21 @@ app = Flask(
     template_folder=os.path.join(SCRIPT_DIR, "templates"),
     static_folder=os.path.join(SCRIPT_DIR, "static"),
 )
+# API responses are built in a fixed order already; skip sorting every
+# dict's keys and the pretty-printing Flask would add in debug mode
+app.json.sort_keys = False
+app.json.compact = True
 
 # Initialize SocketIO
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
 
-# Global state for web-triggered captures
-scanner_state["capture_requested"] = False
+# Web-triggered captures write a byte here; the capture loop selects on the
+# read end alongside stdin, so it sleeps until there's something to do.
+# Finished background rotations write ROTATION_WAKE, which only wakes the
+# loop to announce them
+CAPTURE_TRIGGER_R, CAPTURE_TRIGGER_W = os.pipe()
+os.set_blocking(CAPTURE_TRIGGER_W, False)
+ROTATION_WAKE = b"r"
 
 
 def emit_status_update(message, color=None):
@@ -68,25 +129,90 @@ def emit_status_update(message, color=None):
     )
 
 
-def emit_gallery_update():
-    """Emit gallery update via WebSocket."""
-    update_image_list()
-    images_data = []
-    for img in sorted(scanner_state["images"]):
-        img_metadata = get_image_metadata(img)
-        images_data.append(img_metadata)
+# Serializes gallery emits so a slower, older update can't overwrite a newer one
+_gallery_lock = Lock()
+
+# Seconds gallery updates are held back so a burst of them goes out as one
+GALLERY_EMIT_DELAY = 0.15
+
+# Gallery updates waiting for the emit timer: the images to send and the
+# timer itself while one is pending
+_gallery_pending = {"files": set(), "timer": None}
+_gallery_pending_lock = Lock()
+
+
+def emit_gallery_update(new_files):
+    """
+    Emit gallery update via WebSocket.
+
+    Only new_files are sent (as a "gallery_append" event the page merges
+    into its gallery), so a capture costs the same however large the
+    session has grown. Recaptured files replace their old entries.
+
+    Updates are sent GALLERY_EMIT_DELAY after the first one asked for, with
+    any that arrive meanwhile merged in, so a capture and its rotation
+    finishing moments later cost one emit. The payload is built on the
+    timer thread, so the capture loop never waits on metadata reads.
+    """
+    with _gallery_pending_lock:
+        _gallery_pending["files"].update(new_files)
+        if _gallery_pending["timer"] is None:
+            timer = Timer(GALLERY_EMIT_DELAY, _flush_gallery_update)
+            timer.daemon = True
+            _gallery_pending["timer"] = timer
+            timer.start()
+
+
+def _flush_gallery_update():
+    with _gallery_pending_lock:
+        new_files = _gallery_pending["files"]
+        _gallery_pending.update(files=set(), timer=None)
+    if new_files:
+        _emit_gallery_append(new_files)
+
+
+def _emit_gallery_append(new_files):
+    with _gallery_lock:
+        images = scanner_state["images"]
+        images_set = scanner_state["images_set"]
+        for filename in new_files:
+            # Recaptures (after jumping back with 'n') replace existing images
+            if filename not in images_set:
+                bisect.insort(images, filename)
+                images_set.add(filename)
+        scanner_state["rev"] += 1
+
+        socketio.emit(
+            "gallery_append",
+            {
+                "images": list(METADATA_POOL.map(get_image_metadata, sorted(new_files))),
+                "image_count": len(images),
+            },
+        )
 
-    socketio.emit(
-        "gallery_update",
-        {"images": images_data, "image_count": len(scanner_state["images"])},
-    )
+
+# Seconds browsers may reuse an image fetched with a ?v= version (its mtime)
+IMAGE_CACHE_MAX_AGE = 86400
+
+
+def send_image(image_path):
+    """
+    Send a JPEG, letting the browser cache it if the URL is versioned.
+
+    Gallery URLs carry the file's mtime as ?v=, so a replaced image gets a
+    new URL and the old one can be cached outright instead of revalidated
+    every time the gallery is re-rendered. Unversioned URLs (e.g. crop
+    previews, which are rewritten in place) are revalidated as before.
+    """
+    max_age = IMAGE_CACHE_MAX_AGE if request.args.get("v") else None
+    return send_file(image_path, mimetype="image/jpeg", max_age=max_age)
 
 
 @app.route("/img/<filename>")
 def serve_image(filename):
     """Serve images from current session directory."""
     try:
-        return send_file(os.path.join(os.getcwd(), filename), mimetype="image/jpeg")
+        return send_image(os.path.join(os.getcwd(), filename))
     except FileNotFoundError:
         return "Image not found", 404
 
@@ -103,7 +229,7 @@ def serve_session_image(session_name, filename):
         if not os.path.abspath(image_path).startswith(os.path.abspath(captures_dir)):
             return "Invalid path", 403
 
-        return send_file(image_path, mimetype="image/jpeg")
+        return send_image(image_path)
     except FileNotFoundError:
         return "Image not found", 404
 
@@ -130,87 +256,100 @@ def api_camera_info():
     if not scanner_state["left_cam_serial"] or not scanner_state["right_cam_serial"]:
         result["status"] = "Querying (this may take a moment)..."
         try:
-            # Query left camera only
-            if scanner_state["left_cam_port"] and not scanner_state["left_cam_serial"]:
-                try:
-                    output = subprocess.check_output(
-                        [GPHOTO, "--port", scanner_state["left_cam_port"], "--summary"],
-                        timeout=3,
-                        stderr=subprocess.DEVNULL,
-                    ).decode()
-                    serial_match = re.search(r"Serial Number:\s+(.+)", output)
-                    if serial_match:
-                        serial = serial_match.group(1).strip()
-                        scanner_state["left_cam_serial"] = serial
-                        result["left"]["serial"] = serial
-                except subprocess.TimeoutExpired:
-                    result["left"]["serial"] = "Timeout - try later"
-                except Exception as e:
-                    result["left"]["serial"] = "Unavailable"
-
-            # Query right camera only
-            if (
-                scanner_state["right_cam_port"]
-                and not scanner_state["right_cam_serial"]
-            ):
-                try:
-                    output = subprocess.check_output(
-                        [
-                            GPHOTO,
-                            "--port",
-                            scanner_state["right_cam_port"],
-                            "--summary",
-                        ],
-                        timeout=3,
-                        stderr=subprocess.DEVNULL,
-                    ).decode()
-                    serial_match = re.search(r"Serial Number:\s+(.+)", output)
-                    if serial_match:
-                        serial = serial_match.group(1).strip()
-                        scanner_state["right_cam_serial"] = serial
-                        result["right"]["serial"] = serial
-                except subprocess.TimeoutExpired:
-                    result["right"]["serial"] = "Timeout - try later"
-                except Exception as e:
-                    result["right"]["serial"] = "Unavailable"
+            sides = [
+                side
+                for side in ("left", "right")
+                if scanner_state[f"{side}_cam_port"]
+                and not scanner_state[f"{side}_cam_serial"]
+            ]
+            # Each query pays gphoto2's start-up, so run both sides at once
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                serials = executor.map(
+                    lambda side: query_summary_serial(scanner_state[f"{side}_cam_port"]),
+                    sides,
+                )
+                for side, (serial, display) in zip(sides, serials):
+                    if serial:
+                        scanner_state[f"{side}_cam_serial"] = serial
+                    if display:
+                        result[side]["serial"] = display
 
             result["status"] = "Query complete"
         except Exception as e:
             result["error"] = str(e)
 
-    return json.dumps(result)
+    return jsonify(result)
 
 
-@app.route("/api/disk-usage")
-def api_disk_usage():
-    """Get disk usage for captures directory and USB backup."""
+def query_summary_serial(port):
+    """
+    Read a camera's serial number from `gphoto2 --summary`.
 
-    def get_usage(path):
-        """Get disk usage for a path, returns None if path doesn't exist."""
-        if not os.path.exists(path):
-            return None
+    Returns:
+        (serial, display) - serial is None if it couldn't be read, and
+        display is what to show the user in that case
+    """
+    try:
+        ok, output = gphoto_command(port, ["--summary"], timeout=3)
+    except subprocess.TimeoutExpired:
+        return None, "Timeout - try later"
+    except Exception:
+        return None, "Unavailable"
+    serial = parse_summary(output).get("serial") if ok else None
+    if not serial:
+        return None, None
+    return serial, serial
+
+
+# Seconds a disk usage reading is reused for
+DISK_USAGE_TTL = 2.0
+
+# Recent disk usage readings per path, with the time they were taken
+_disk_usage_cache = {}
+
+
+def get_disk_usage(path):
+    """
+    Get disk usage for a path, returns None if path doesn't exist.
+
+    Readings are reused for DISK_USAGE_TTL seconds so several open browser
+    tabs polling at once share one statvfs per path.
+    """
+    now = time.monotonic()
+    cached = _disk_usage_cache.get(path)
+    if cached and now - cached[0] < DISK_USAGE_TTL:
+        return cached[1]
+
+    result = None
+    if os.path.exists(path):
         try:
             usage = shutil.disk_usage(path)
-            return {
+            result = {
                 "total": usage.total,
                 "used": usage.used,
                 "free": usage.free,
                 "percent_used": round(usage.used / usage.total * 100, 1),
             }
         except Exception:
-            return None
+            pass
+    _disk_usage_cache[path] = (now, result)
+    return result
 
+
+@app.route("/api/disk-usage")
+def api_disk_usage():
+    """Get disk usage for captures directory and USB backup."""
     captures_path = os.path.join(SCRIPT_DIR, "captures")
     usb_path = "/mnt/usb"
 
     result = {
-        "captures": get_usage(captures_path),
+        "captures": get_disk_usage(captures_path),
         "captures_path": captures_path,
-        "usb": get_usage(usb_path),
+        "usb": get_disk_usage(usb_path),
         "usb_path": usb_path,
     }
 
-    return json.dumps(result)
+    return jsonify(result)
 
 
 @app.route("/api/battery-levels")
@@ -223,21 +362,21 @@ def api_battery_levels():
     }
 
     try:
-        # Query left camera battery
-        if scanner_state["left_cam_port"]:
-            battery = get_battery_level(scanner_state["left_cam_port"])
-            scanner_state["left_cam_battery"] = battery
-            result["left"]["battery"] = battery
-
-        # Query right camera battery
-        if scanner_state["right_cam_port"]:
-            battery = get_battery_level(scanner_state["right_cam_port"])
-            scanner_state["right_cam_battery"] = battery
-            result["right"]["battery"] = battery
+        sides = [side for side in ("left", "right") if scanner_state[f"{side}_cam_port"]]
+        # Query both cameras at once; each goes through its camera shell if
+        # one is open, otherwise through its own gphoto2 process
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            levels = executor.map(
+                lambda side: get_battery_level(scanner_state[f"{side}_cam_port"]),
+                sides,
+            )
+            for side, battery in zip(sides, levels):
+                scanner_state[f"{side}_cam_battery"] = battery
+                result[side]["battery"] = battery
     except Exception as e:
         result["error"] = str(e)
 
-    return json.dumps(result)
+    return jsonify(result)
 
 
 @app.route("/api/notes", methods=["GET", "POST"])
@@ -245,7 +384,7 @@ def api_notes():
     """Get or update scan notes."""
     if request.method == "GET":
         notes = scanner_state.get("metadata", {}).get("notes", "")
-        return json.dumps({"notes": notes})
+        return jsonify({"notes": notes})
 
     elif request.method == "POST":
         data = request.get_json()
@@ -261,24 +400,45 @@ def api_notes():
             )
             if metadata_file and os.path.exists(os.path.dirname(metadata_file)):
                 try:
-                    with open(metadata_file, "w") as f:
-                        json.dump(scanner_state["metadata"], f, indent=2)
-                    return json.dumps({"success": True})
+                    save_metadata(metadata_file, scanner_state["metadata"])
+                    return jsonify({"success": True})
                 except Exception as e:
-                    return json.dumps({"success": False, "error": str(e)})
+                    return jsonify({"success": False, "error": str(e)})
+
+        return jsonify({"success": False, "error": "No active session"})
+
+
+def conditional_json(payload):
+    """
+    jsonify payload with an ETag, answering 304 if the client already has it.
+
+    Polling pages then get an empty response while nothing changes, and
+    Cache-Control makes the browser revalidate instead of reusing a stale copy.
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
 
-        return json.dumps({"success": False, "error": "No active session"})
+
+# Gallery metadata built for the last gallery rev: (rev, images data)
+_gallery_data_cache = (None, None)
 
 
 @app.route("/api/gallery-data")
 def api_gallery_data():
     """Return gallery data as JSON."""
-    images_data = []
-    for img in sorted(scanner_state["images"]):
-        img_metadata = get_image_metadata(img)
-        images_data.append(img_metadata)
+    global _gallery_data_cache
+    rev, images_data = _gallery_data_cache
+    if rev != scanner_state["rev"]:
+        rev = scanner_state["rev"]
+        # A copy, as an emit may be inserting into the list meanwhile
+        images_data = list(
+            METADATA_POOL.map(get_image_metadata, list(scanner_state["images"]))
+        )
+        _gallery_data_cache = (rev, images_data)
 
-    return json.dumps(
+    return conditional_json(
         {
             "left_cam_port": scanner_state["left_cam_port"],
             "right_cam_port": scanner_state["right_cam_port"],
@@ -306,17 +466,10 @@ def api_sessions():
         for session_name in sorted(os.listdir(captures_dir), reverse=True):
             session_path = os.path.join(captures_dir, session_name)
             if os.path.isdir(session_path):
-                metadata_file = os.path.join(session_path, "scan_metadata.json")
-                metadata = {}
-                if os.path.exists(metadata_file):
-                    try:
-                        with open(metadata_file, "r") as f:
-                            metadata = json.load(f)
-                    except:
-                        pass
+                metadata = load_session_metadata(session_path)
 
                 # Count images in session
-                image_files = glob.glob(os.path.join(session_path, "img*.jpg"))
+                image_files = list_session_images(session_path)
 
                 sessions.append(
                     {
@@ -328,7 +481,7 @@ def api_sessions():
                     }
                 )
 
-    return json.dumps({"sessions": sessions})
+    return conditional_json({"sessions": sessions})
 
 
 @app.route("/api/session/<session_name>/images")
@@ -338,36 +491,59 @@ def api_session_images(session_name):
     session_path = os.path.join(captures_dir, session_name)
 
     if not os.path.exists(session_path):
-        return json.dumps({"error": "Session not found"}), 404
+        return jsonify({"error": "Session not found"}), 404
 
-    images_data = []
-    image_files = sorted(glob.glob(os.path.join(session_path, "img*.jpg")))
+    # Only name, size and mtime here so that browsing a large archived
+    # session never opens the JPEGs; the gallery fetches EXIF per image
+    # from /api/image-exif as images scroll into view
+    images_data = [get_file_metadata(path) for path in list_session_images(session_path)]
 
-    for img_path in image_files:
-        img_metadata = get_image_metadata(img_path)
-        images_data.append(img_metadata)
+    return jsonify({"images": images_data, "session_name": session_name})
 
-    return json.dumps({"images": images_data, "session_name": session_name})
+
+@app.route("/api/image-exif/<session_name>/<filename>")
+def api_image_exif(session_name, filename):
+    """Return full metadata (dimensions and EXIF) for one session image."""
+    captures_dir = os.path.join(SCRIPT_DIR, "captures")
+    image_path = os.path.join(captures_dir, session_name, filename)
+
+    # Security: ensure we're still within captures directory
+    if not os.path.abspath(image_path).startswith(os.path.abspath(captures_dir)):
+        return jsonify({"error": "Invalid path"}), 403
+
+    if os.path.basename(filename) != filename or not os.path.isfile(image_path):
+        return jsonify({"error": "Image not found"}), 404
+
+    return jsonify(get_image_metadata(image_path))
 
 
 @socketio.on("trigger_capture")
 def handle_capture_trigger():
     """Handle capture request from web interface."""
-    scanner_state["capture_requested"] = True
+    try:
+        os.write(CAPTURE_TRIGGER_W, b"b")
+    except BlockingIOError:
+        pass  # Plenty of requests already queued
     emit_status_update("Capture requested from web...", "ff9")
     return {"status": "ok"}
 
 
+@lru_cache(maxsize=None)
+def render_page(template_name):
+    """Render a page template once; the pages take no template variables."""
+    return render_template(template_name)
+
+
 @app.route("/")
 def index():
     """Serve the main scanner interface."""
-    return render_template("index.html")
+    return render_page("index.html")
 
 
 @app.route("/crop")
 def crop_interface():
     """Serve the crop interface."""
-    return render_template("crop.html")
+    return render_page("crop.html")
 
 
 @app.route("/api/preview/<camera>")
@@ -408,19 +584,30 @@ def api_preview_capture(camera):
         tmp_path = tmp.name
 
     try:
-        result = subprocess.run(
-            [GPHOTO, "--capture-image-and-download", "--force-overwrite",
-             "--port", cam_port, "--filename", tmp_path],
-            capture_output=True,
-            timeout=30
-        )
+        # A camera held by a shell can only be reached through that shell
+        shell = camera_shells.get(cam_port)
+        if shell and shell.alive():
+            if not shell.capture(tmp_path):
+                return jsonify({
+                    "status": "error",
+                    "message": "Capture failed",
+                    "port": cam_port
+                }), 500
+        else:
+            result = subprocess.run(
+                [GPHOTO, "--capture-image-and-download", "--force-overwrite",
+                 "--port", cam_port, "--filename", tmp_path],
+                capture_output=True,
+                errors="replace",
+                timeout=CAPTURE_TIMEOUT
+            )
 
-        if result.returncode != 0:
-            return jsonify({
-                "status": "error",
-                "message": f"Capture failed: {result.stderr.decode()}",
-                "port": cam_port
-            }), 500
+            if result.returncode != 0:
+                return jsonify({
+                    "status": "error",
+                    "message": f"Capture failed: {result.stderr}",
+                    "port": cam_port
+                }), 500
 
         # Read and encode as base64
         with open(tmp_path, "rb") as f:
@@ -496,15 +683,10 @@ CAMERA_SETTINGS = [
 def get_camera_config(port, config_path):
     """Get a single config value and its choices from a camera."""
     try:
-        result = subprocess.run(
-            [GPHOTO, "--port", port, "--get-config", config_path],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode != 0:
+        ok, output = gphoto_command(port, ["--get-config", config_path])
+        if not ok:
             return None
 
-        output = result.stdout.decode()
         config = {"path": config_path, "current": None, "choices": [], "readonly": False, "type": None}
 
         for line in output.split("\n"):
@@ -530,12 +712,8 @@ def get_camera_config(port, config_path):
 def set_camera_config(port, config_path, value):
     """Set a config value on a camera."""
     try:
-        result = subprocess.run(
-            [GPHOTO, "--port", port, "--set-config", f"{config_path}={value}"],
-            capture_output=True,
-            timeout=5
-        )
-        return result.returncode == 0, result.stderr.decode() if result.returncode != 0 else ""
+        ok, output = gphoto_command(port, ["--set-config", f"{config_path}={value}"])
+        return ok, "" if ok else output
     except Exception as e:
         return False, str(e)
 
@@ -645,8 +823,9 @@ def api_crop_settings():
         # Save crop settings
         crop_data = request.get_json()
         try:
-            with open(crop_file, "w") as f:
-                json.dump(crop_data, f, indent=2)
+            # Serialized up front and swapped in whole, like save_metadata
+            data = json.dumps(crop_data, indent=2)
+            _write_text_replacing(crop_file, data)
             return jsonify({"status": "ok", "message": "Crop settings saved"})
         except Exception as e:
             return jsonify({"status": "error", "message": str(e)}), 500
@@ -691,22 +870,20 @@ def api_crop_preview():
         return jsonify({"status": "error", "message": "Image not found"}), 404
 
     try:
-        # Open image and draw crop rectangle
-        img = Image.open(image_path)
-        draw = ImageDraw.Draw(img)
+        # Only the header is read here, for the default right/bottom edges
+        # (after any EXIF-only rotation is applied, as preview_crop would)
+        width, height = get_upright_size(image_path)
 
-        # Draw red rectangle
         left = crop_box.get("left", 0)
         top = crop_box.get("top", 0)
-        right = crop_box.get("right", img.width)
-        bottom = crop_box.get("bottom", img.height)
-
-        draw.rectangle([left, top, right, bottom], outline="red", width=10)
+        right = crop_box.get("right", width)
+        bottom = crop_box.get("bottom", height)
 
-        # Save preview
-        preview_filename = image_filename.replace(".jpg", "_crop_preview.jpg")
-        preview_path = os.path.join(session_dir, preview_filename)
-        img.save(preview_path, quality=95)
+        # process.py's preview_crop decodes at reduced size (libjpeg DCT
+        # scaling), draws the outline in scaled coordinates and saves a
+        # small quality-80 preview next to the image
+        preview_path = preview_crop(image_path, (left, top, right, bottom))
+        preview_filename = os.path.basename(preview_path)
 
         return jsonify(
             {
@@ -739,7 +916,7 @@ def api_apply_crop():
         session_dir = scanner_state.get("session_dir", os.getcwd())
 
     # Find all images
-    images = sorted(glob.glob(os.path.join(session_dir, "img*.jpg")))
+    images = list_session_images(session_dir)
 
     if not images:
         return jsonify({"status": "error", "message": "No images found"}), 404
@@ -754,23 +931,41 @@ def api_apply_crop():
         right = crop_box.get("right")
         bottom = crop_box.get("bottom")
 
-        cropped_count = 0
-        for img_path in images:
-            img = Image.open(img_path)
-            cropped = img.crop((left, top, right, bottom))
-
-            basename = os.path.basename(img_path)
-            output_path = os.path.join(
-                output_dir, basename.replace(".jpg", "_cropped.jpg")
+        # Crops go through process.py's apply_crop, the same exact crop as
+        # the CLI's apply-crop. Block-aligned boxes are cropped by jpegtran
+        # in the DCT domain (no decode/re-encode, no quality loss); others
+        # decode only the blocks they cover. Pillow releases the GIL, so a
+        # thread per core also keeps re-encodes parallel
+        # Each crop reports its own failure, so one bad image doesn't stop
+        # the others or hide which file it was
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(
+                executor.map(
+                    lambda img_path: _crop_worker(
+                        img_path, (left, top, right, bottom), output_dir
+                    ),
+                    images,
+                )
             )
-            cropped.save(output_path, quality=95)
-            cropped_count += 1
+        failed = [
+            {"filename": os.path.basename(img_path), "error": str(error)}
+            for img_path, error in results
+            if error
+        ]
+        cropped_count = len(results) - len(failed)
+
+        message = f"Cropped {cropped_count} images"
+        if failed:
+            names = ", ".join(f["filename"] for f in failed)
+            message += f"; {len(failed)} failed: {names}"
 
         return jsonify(
             {
-                "status": "ok",
-                "message": f"Cropped {cropped_count} images",
+                "status": "ok" if cropped_count else "error",
+                "message": message,
                 "output_dir": "cropped",
+                "cropped": cropped_count,
+                "failed": failed,
             }
         )
 
@@ -778,23 +973,114 @@ def api_apply_crop():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
-def get_file_size(filename):
-    """Get file size in MB."""
-    try:
-        if os.path.exists(filename):
-            size_bytes = os.path.getsize(filename)
-            size_mb = size_bytes / (1024 * 1024)
-            return f"{size_mb:.2f} MB"
-    except:
-        pass
-    return "N/A"
+def format_size(size_bytes):
+    """Format a file size in MB for display."""
+    if size_bytes is None:
+        return "N/A"
+    return f"{size_bytes / (1024 * 1024):.2f} MB"
+
+
+def get_file_metadata(image_path):
+    """Return the metadata that needs only a stat(): filename, size and mtime."""
+    st = os.stat(image_path)
+    return {
+        "filename": os.path.basename(image_path),
+        "size": format_size(st.st_size),
+        "mtime": st.st_mtime,
+    }
+
+
+# Header reads for uncached images are independent and mostly waiting on
+# the disk (file reads release the GIL), so galleries read them
+# side by side
+METADATA_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4))
+
+# Bytes read from the start of a JPEG for metadata. The markers Pillow needs
+# (APP1/EXIF with its thumbnail, SOF) sit well inside this.
+METADATA_HEADER_SIZE = 128 * 1024
+
+# EXIF tag ids read for the gallery. Make, Model and DateTime are in the
+# main IFD; the exposure settings are in the Exif sub-IFD it points to.
+EXIF_IFD_POINTER = 0x8769
+EXIF_MAKE = 271
+EXIF_MODEL = 272
+EXIF_DATETIME = 306
+EXIF_EXPOSURE_TIME = 33434
+EXIF_FNUMBER = 33437
+EXIF_ISO = 34855
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_FOCAL_LENGTH = 37386
+
+
+def _exif_ratio(value):
+    """Return an EXIF rational (tuple, IFDRational or number) as a float."""
+    if isinstance(value, tuple):
+        return value[0] / value[1]
+    return float(value)
+
+
+def _format_exposure(value):
+    # Convert to fraction
+    if isinstance(value, tuple):
+        numerator, denominator = value
+    else:
+        numerator = getattr(value, "numerator", value)
+        denominator = getattr(value, "denominator", 1)
+    if denominator == 1:
+        return f"{numerator}s"
+    return f"{numerator}/{denominator}s"
+
+
+# (tag id, metadata key, formatter) for each EXIF field the gallery shows.
+# DateTimeOriginal comes before DateTime so it wins when both are present.
+EXIF_FIELDS = [
+    (EXIF_MAKE, "camera_make", lambda value: str(value).strip()),
+    (EXIF_MODEL, "camera_model", lambda value: str(value).strip()),
+    (EXIF_ISO, "iso", lambda value: f"ISO {value}"),
+    (EXIF_EXPOSURE_TIME, "shutter_speed", _format_exposure),
+    (EXIF_FNUMBER, "aperture", lambda value: f"f/{_exif_ratio(value):.1f}"),
+    (EXIF_FOCAL_LENGTH, "focal_length", lambda value: f"{_exif_ratio(value):.0f}mm"),
+    (EXIF_DATETIME_ORIGINAL, "date_taken", str),
+    (EXIF_DATETIME, "date_taken", str),
+]
 
 
 def get_image_metadata(image_path):
-    """Extract detailed metadata from image including EXIF data."""
+    """
+    Extract detailed metadata from image including EXIF data.
+
+    Results are cached per (path, mtime, size), so the gallery only re-reads
+    files that are new or have been replaced (e.g. after rotation).
+    """
+    try:
+        st = os.stat(image_path)
+        mtime_ns, size = st.st_mtime_ns, st.st_size
+    except OSError:
+        mtime_ns = size = None
+    return dict(_read_image_metadata(os.path.abspath(image_path), mtime_ns, size))
+
+
+def _open_image_header(image_path, header):
+    """
+    Open an image for its size and EXIF from header, the start of the file.
+
+    One read of METADATA_HEADER_SIZE bytes replaces Pillow's many small
+    buffered reads of the marker segments, which adds up over USB or
+    network storage. Files whose headers don't fit are opened normally.
+    """
+    try:
+        return Image.open(io.BytesIO(header))
+    except Exception:
+        return Image.open(image_path)
+
+
+@lru_cache(maxsize=4096)
+def _read_image_metadata(image_path, mtime_ns, size):
+    """Read metadata for one version of a file (see get_image_metadata)."""
     metadata = {
         "filename": os.path.basename(image_path),
-        "size": get_file_size(image_path),
+        "size": format_size(size),
+        "mtime": mtime_ns / 1e9 if mtime_ns is not None else None,
         "width": None,
         "height": None,
         "camera_make": None,
@@ -807,108 +1093,369 @@ def get_image_metadata(image_path):
     }
 
     try:
-        with Image.open(image_path) as img:
-            # Get basic dimensions
-            metadata["width"] = img.width
-            metadata["height"] = img.height
-            metadata["megapixels"] = f"{(img.width * img.height) / 1000000:.1f} MP"
-
-            # Extract EXIF data
-            exif_data = img.getexif()
-            if exif_data:
-                for tag_id, value in exif_data.items():
-                    tag = TAGS.get(tag_id, tag_id)
-
-                    if tag == "Make":
-                        metadata["camera_make"] = str(value).strip()
-                    elif tag == "Model":
-                        metadata["camera_model"] = str(value).strip()
-                    elif tag == "ISOSpeedRatings":
-                        metadata["iso"] = f"ISO {value}"
-                    elif tag == "ExposureTime":
-                        # Convert to fraction
-                        if isinstance(value, tuple):
-                            metadata["shutter_speed"] = f"{value[0]}/{value[1]}s"
-                        else:
-                            metadata["shutter_speed"] = f"{value}s"
-                    elif tag == "FNumber":
-                        if isinstance(value, tuple):
-                            f_num = value[0] / value[1]
-                            metadata["aperture"] = f"f/{f_num:.1f}"
-                        else:
-                            metadata["aperture"] = f"f/{value:.1f}"
-                    elif tag == "FocalLength":
-                        if isinstance(value, tuple):
-                            fl = value[0] / value[1]
-                            metadata["focal_length"] = f"{fl:.0f}mm"
-                        else:
-                            metadata["focal_length"] = f"{value:.0f}mm"
-                    elif tag == "DateTimeOriginal" or tag == "DateTime":
-                        if not metadata["date_taken"]:
-                            metadata["date_taken"] = str(value)
+        with open(image_path, "rb") as f:
+            header = f.read(METADATA_HEADER_SIZE)
+        # The size comes straight from the JPEG frame header; Pillow is
+        # only brought in for the EXIF, or for files the scan can't size
+        has_exif, dimensions = scan_jpeg_header(header)
+        exif_data = {}
+        if has_exif or not dimensions:
+            with _open_image_header(image_path, header) as img:
+                dimensions = dimensions or img.size
+                exif = img.getexif()
+                exif_data = {**exif, **exif.get_ifd(EXIF_IFD_POINTER)}
+
+        # Get basic dimensions
+        width, height = dimensions
+        metadata["width"] = width
+        metadata["height"] = height
+        metadata["megapixels"] = f"{(width * height) / 1000000:.1f} MP"
+
+        # Extract EXIF data
+        for tag_id, key, formatter in EXIF_FIELDS:
+            value = exif_data.get(tag_id)
+            if value is not None and metadata[key] is None:
+                metadata[key] = formatter(value)
     except Exception as e:
         print(f"Error extracting metadata from {image_path}: {e}")
 
     return metadata
 
 
+class PersistentCamera:
+    """
+    A long-lived `gphoto2 --shell` session for one camera.
+
+    Starting gphoto2 and claiming the camera over libusb takes about a
+    second, which used to be paid on every capture. The shell keeps the
+    camera claimed; commands are written to its stdin and their output is
+    read back up to the next prompt. The shell only saves downloads under
+    the --filename it was started with, so captures land in a per-camera
+    staging file and are renamed to their real name afterwards.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.staging_path = os.path.abspath(
+            ".capture-" + re.sub(r"[^A-Za-z0-9]", "_", port) + ".jpg"
+        )
+        self.proc = None
+        self.lock = Lock()
+        # Deferred captures still on the card: (camera path, local filename)
+        self.on_card = []
+
+    def start(self):
+        """Launch the shell and wait for its first prompt."""
+        self.proc = subprocess.Popen(
+            [
+                GPHOTO,
+                "--port",
+                self.port,
+                "--force-overwrite",
+                "--filename",
+                self.staging_path,
+                "--shell",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        )
+        try:
+            self._read_until_prompt(timeout=10)
+        except (TimeoutError, EOFError, OSError) as e:
+            logger.debug("gphoto2 shell on %s did not start: %s", self.port, e)
+            self.close()
+            return False
+        return True
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def close(self):
+        """Exit the shell, killing it if it doesn't go quietly."""
+        if self.proc is None:
+            return
+        try:
+            if self.proc.poll() is None:
+                self.proc.stdin.write(b"exit\n")
+                self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def _read_until_prompt(self, timeout):
+        """Return everything the shell prints before its next prompt."""
+        fd = self.proc.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        output = b""
+        while not SHELL_PROMPT.search(output):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"no prompt from gphoto2 after {timeout}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if ready:
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    raise EOFError("gphoto2 shell exited")
+                output += chunk
+        return SHELL_PROMPT.sub(b"", output).decode(errors="replace")
+
+    def run(self, command, timeout=5):
+        """
+        Run one shell command.
+
+        Returns:
+            (ok, output) - ok is False if gphoto2 reported an error or the
+            shell died or hung, in which case it's closed and will be
+            restarted on next use
+        """
+        with self.lock:
+            return self._run(command, timeout)
+
+    def _run(self, command, timeout):
+        if not self.alive():
+            return False, "gphoto2 shell is not running"
+        try:
+            self.proc.stdin.write(command.encode() + b"\n")
+            output = self._read_until_prompt(timeout)
+        except (TimeoutError, EOFError, OSError) as e:
+            self.close()
+            return False, str(e)
+        return "*** Error" not in output, output
+
+    def capture(self, filename, barrier=None):
+        """Capture and download one image to filename, returning success."""
+        with self.lock:
+            if os.path.exists(self.staging_path):
+                os.remove(self.staging_path)
+            sync_capture(barrier)
+            ok, output = self._run("capture-image-and-download", CAPTURE_TIMEOUT)
+            if not ok or not os.path.exists(self.staging_path):
+                logger.debug("Capture on %s failed: %s", self.port, output.strip())
+                return False
+            # shutil.move, as filename may be on another filesystem (/tmp)
+            shutil.move(self.staging_path, filename)
+            return True
+
+    def trigger(self, filename, barrier=None):
+        """
+        Capture one image to the camera's card without downloading it.
+
+        The card location is remembered so download_deferred() can later
+        fetch it as filename. Returns success.
+        """
+        with self.lock:
+            sync_capture(barrier)
+            ok, output = self._run("capture-image", CAPTURE_TIMEOUT)
+            match = CARD_FILE.search(output)
+            if not ok or not match:
+                logger.debug("Capture on %s failed: %s", self.port, output.strip())
+                return False
+            self.on_card.append((match.group(1), filename))
+            return True
+
+    def download_deferred(self):
+        """
+        Download every deferred capture to its filename.
+
+        Returns:
+            Number of images that couldn't be downloaded (they stay queued)
+        """
+        with self.lock:
+            failed = []
+            for card_path, filename in self.on_card:
+                if os.path.exists(self.staging_path):
+                    os.remove(self.staging_path)
+                ok, output = self._run(f"get {card_path}", CAPTURE_TIMEOUT)
+                if not ok or not os.path.exists(self.staging_path):
+                    logger.debug("Download of %s failed: %s", card_path, output.strip())
+                    failed.append((card_path, filename))
+                    continue
+                shutil.move(self.staging_path, filename)
+            self.on_card = failed
+            return len(failed)
+
+
+def sync_capture(barrier):
+    """
+    Wait at barrier (if any) until the paired capture is ready to trigger too.
+
+    A side that can't take part breaks the barrier, as does a timeout, and
+    the waiting side then goes ahead alone rather than being held up.
+    """
+    if barrier is None:
+        return
+    try:
+        barrier.wait()
+    except BrokenBarrierError:
+        pass
+
+
+class ShellCapture:
+    """Popen-like handle for a capture running in a PersistentCamera."""
+
+    def __init__(self, camera, filename, deferred=False, barrier=None):
+        self.returncode = None
+        self._camera = camera
+        self._done = Event()
+        capture = camera.trigger if deferred else camera.capture
+        Thread(
+            target=self._run, args=(capture, filename, barrier), daemon=True
+        ).start()
+
+    def _run(self, capture, filename, barrier):
+        self.returncode = 0 if capture(filename, barrier) else 1
+        self._done.set()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired("gphoto2 --shell", timeout)
+        return self.returncode
+
+    def kill(self):
+        # Closing the shell ends the capture; it's reopened on next use
+        self._camera.close()
+
+
+# Live gphoto2 shells, keyed by camera port
+camera_shells = {}
+
+
+def open_camera_shell(port):
+    """Return a running shell for port, starting one if needed (None on failure)."""
+    shell = camera_shells.get(port)
+    if shell and shell.alive():
+        return shell
+    # A restarted shell keeps its object, and with it any deferred captures
+    # still waiting on the card
+    if not shell:
+        shell = camera_shells[port] = PersistentCamera(port)
+    if not shell.start():
+        return None
+    return shell
+
+
+def set_capture_target(port, card):
+    """Make captures on port stay on the camera card (card=True) or in RAM."""
+    ok, output = gphoto_command(
+        port, ["--set-config", f"capturetarget={1 if card else 0}"]
+    )
+    if not ok:
+        print(f"WARNING: Could not set capture target on {port}: {output.strip()}")
+    return ok
+
+
+def download_from_cards(deferred_pairs, pending_rotations):
+    """
+    Fetch every deferred capture from the camera cards, then queue each
+    complete pair for rotation as if it had just been captured.
+    """
+    shells = [shell for shell in camera_shells.values() if shell.on_card]
+    for shell in shells:
+        open_camera_shell(shell.port)  # Restart any shell that has died
+    if shells:
+        total = sum(len(shell.on_card) for shell in shells)
+        print(f"Downloading {total} images from camera cards...")
+        with ThreadPoolExecutor(max_workers=len(shells)) as pool:
+            failed = sum(pool.map(PersistentCamera.download_deferred, shells))
+        if failed:
+            print(f"WARNING: {failed} images are still only on the camera cards")
+
+    for rightpic, leftpic in deferred_pairs:
+        if os.path.exists(rightpic) and os.path.exists(leftpic):
+            rotate_pair_in_background(pending_rotations, rightpic, leftpic)
+    deferred_pairs.clear()
+
+
+def close_camera_shells():
+    """Shut down every camera shell."""
+    for shell in camera_shells.values():
+        shell.close()
+    camera_shells.clear()
+
+
+def gphoto_command(port, args, timeout=5):
+    """
+    Run a single gphoto2 action (e.g. ["--get-config", path]) on a camera.
+
+    If the camera is held by a live shell the equivalent shell command is
+    sent to it, since a second gphoto2 process can't claim the camera;
+    otherwise a one-off gphoto2 process is run.
+
+    Returns:
+        (ok, output) with stdout and stderr combined
+    """
+    shell = camera_shells.get(port)
+    if shell and shell.alive():
+        return shell.run(" ".join([args[0].lstrip("-")] + args[1:]), timeout)
+
+    result = subprocess.run(
+        [GPHOTO, "--port", port] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        errors="replace",
+        timeout=timeout,
+    )
+    return result.returncode == 0, result.stdout
+
+
 def get_battery_level(port):
     """Get battery level for a camera via gphoto2 config."""
     try:
-        output = subprocess.check_output(
-            [GPHOTO, f"--port={port}", "--get-config", "/main/status/batterylevel"],
-            timeout=3,
-            stderr=subprocess.DEVNULL,
-        ).decode()
+        ok, output = gphoto_command(
+            port, ["--get-config", "/main/status/batterylevel"], timeout=3
+        )
+        if not ok:
+            # Config option may not exist on this camera
+            return None
         # Parse output like "Current: 100%" or "Current: 67%"
-        match = re.search(r"Current:\s*(\d+)%?", output)
+        match = BATTERY_PERCENT.search(output)
         if match:
             return int(match.group(1))
         # Some cameras return text like "Low", "Half", "Full"
-        text_match = re.search(r"Current:\s*(.+)", output)
+        text_match = BATTERY_TEXT.search(output)
         if text_match:
             level_text = text_match.group(1).strip().lower()
             # Map common text values to percentages
             level_map = {"low": 20, "half": 50, "full": 100, "high": 80}
             return level_map.get(level_text, None)
-    except subprocess.CalledProcessError:
-        # Config option may not exist on this camera
-        pass
     except Exception as e:
-        print(f"DEBUG: Error getting battery level for {port}: {e}")
+        logger.debug("Error getting battery level for %s: %s", port, e)
     return None
 
 
+def parse_summary(summary):
+    """Extract model, manufacturer and serial from `gphoto2 --summary` output."""
+    fields = {}
+    for match in SUMMARY_FIELD.finditer(summary):
+        # The first occurrence of each field wins
+        fields.setdefault(SUMMARY_KEYS[match.group(1)], match.group(2).strip())
+    return fields
+
+
 def get_camera_info(port):
     """Get camera model and other info from gphoto2."""
     info = {"serial": None, "model": None, "manufacturer": None, "battery": None}
 
     try:
         # Get camera summary which contains model info
-        summary = subprocess.check_output(
-            [GPHOTO, f"--port={port}", "--summary"], timeout=3, stderr=subprocess.STDOUT
-        ).decode()
-
-        # Extract model
-        model_match = re.search(r"Model:\s+(.+)", summary)
-        if model_match:
-            info["model"] = model_match.group(1).strip()
+        ok, summary = gphoto_command(port, ["--summary"], timeout=3)
+        if not ok:
+            raise RuntimeError(summary.strip())
 
-        # Extract manufacturer
-        mfr_match = re.search(r"Manufacturer:\s+(.+)", summary)
-        if mfr_match:
-            info["manufacturer"] = mfr_match.group(1).strip()
-
-        # Extract serial
-        serial_match = re.search(r"Serial Number:\s+(.+)", summary)
-        if serial_match:
-            info["serial"] = serial_match.group(1).strip()
+        # Extract model, manufacturer and serial
+        info.update(parse_summary(summary))
 
         # Get battery level
         info["battery"] = get_battery_level(port)
 
     except Exception as e:
-        print(f"DEBUG: Error getting camera info for {port}: {e}")
+        logger.debug("Error getting camera info for %s: %s", port, e)
 
     return info
 
@@ -920,55 +1467,207 @@ def query_single_port_serial(port):
         if camera_info["serial"]:
             return (port, camera_info["serial"], camera_info)
         else:
-            print(f"DEBUG: No serial found for {port}")
+            logger.debug("No serial found for %s", port)
             return (port, None, camera_info)
     except Exception as e:
-        print(f"DEBUG: Error querying {port}: {e}")
+        logger.debug("Error querying %s: %s", port, e)
         return (port, None, {})
 
 
-def get_all_camera_serials():
-    """Get all camera ports and their serials using parallel port queries."""
+def get_all_camera_serials(known=None):
+    """
+    Get all camera ports and their serials using parallel port queries.
+
+    Args:
+        known: Optional {port: serial} from an earlier call. Ports still
+            present are reused as-is and only newly appeared ports are
+            queried, so retries don't re-claim every camera.
+    """
     try:
         output = subprocess.check_output(
-            [GPHOTO, "--auto-detect"], timeout=3, stderr=subprocess.DEVNULL
-        ).decode()
+            [GPHOTO, "--auto-detect"],
+            timeout=3,
+            stderr=subprocess.DEVNULL,
+            errors="replace",
+        )
         # Find all usb ports
-        ports = re.findall(r"usb:\d*,\d*", output)
-        print(f"DEBUG: Found ports: {ports}")
+        ports = USB_PORT.findall(output)
+        logger.debug("Found ports: %s", ports)
 
+        known = known or {}
+        previous_info = scanner_state.get("camera_info_map", {})
         port_serial_map = {}
         port_info_map = {}  # Store full camera info
-
-        # Query all ports in parallel
-        with ThreadPoolExecutor(max_workers=len(ports)) as executor:
-            future_to_port = {
-                executor.submit(query_single_port_serial, port): port for port in ports
-            }
-            for future in as_completed(future_to_port):
-                port, serial, camera_info = future.result()
-                if serial:
-                    print(f"DEBUG: {port} -> {serial}")
-                    if camera_info.get("model"):
-                        print(f"DEBUG: Camera model: {camera_info['model']}")
-                    port_serial_map[port] = serial
-                    port_info_map[port] = camera_info
+        for port in ports:
+            if port in known:
+                port_serial_map[port] = known[port]
+                port_info_map[port] = previous_info.get(port, {})
+
+        # Query new ports in parallel
+        new_ports = [port for port in ports if port not in known]
+        if new_ports:
+            with ThreadPoolExecutor(max_workers=min(len(new_ports), 4)) as executor:
+                for port, serial, camera_info in executor.map(
+                    query_single_port_serial, new_ports
+                ):
+                    if serial:
+                        logger.debug("%s -> %s", port, serial)
+                        if camera_info.get("model"):
+                            logger.debug("Camera model: %s", camera_info["model"])
+                        port_serial_map[port] = serial
+                        port_info_map[port] = camera_info
+
+        # Keep ports in auto-detect order
+        port_serial_map = {
+            port: port_serial_map[port] for port in ports if port in port_serial_map
+        }
 
         # Store camera info globally for later use
         scanner_state["camera_info_map"] = port_info_map
         return port_serial_map
     except Exception as e:
-        print(f"DEBUG: Error in get_all_camera_serials: {e}")
+        logger.debug("Error in get_all_camera_serials: %s", e)
         return {}
 
 
-def update_image_list():
-    """Scan for all captured images."""
-    scanner_state["images"] = sorted(glob.glob(IMG_FORMAT.replace("%05d", "[0-9]*")))
+# Sorted image paths per session directory, with the directory mtime they
+# were listed at
+_session_index = {}
+
+
+def list_session_images(session_dir):
+    """
+    Return the sorted img*.jpg paths in a session directory.
+
+    Adding, removing or renaming a file bumps the directory's mtime, so the
+    listing is only re-read (with a single scandir) when that changes;
+    otherwise one stat() answers the request.
+    """
+    mtime_ns = os.stat(session_dir).st_mtime_ns
+    cached = _session_index.get(session_dir)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with os.scandir(session_dir) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if entry.name.startswith("img")
+            and entry.name.endswith(".jpg")
+            # d_type from the directory listing, so no extra stat()
+            and entry.is_file()
+        )
+    paths = [os.path.join(session_dir, name) for name in names]
+    _session_index[session_dir] = (mtime_ns, paths)
+    return paths
+
+
+# Parsed scan_metadata.json per session directory, with the file mtime it
+# was read at
+_session_metadata = {}
+
+
+def load_session_metadata(session_dir):
+    """
+    Return a session's scan_metadata.json as a dict ({} if missing/invalid).
+
+    The parsed file is kept until its mtime changes, so listing sessions
+    doesn't re-read every session's metadata on each request.
+    """
+    metadata_file = os.path.join(session_dir, "scan_metadata.json")
+    try:
+        mtime_ns = os.stat(metadata_file).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _session_metadata.get(metadata_file)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    metadata = {}
+    try:
+        with open(metadata_file, "r") as f:
+            metadata = json.load(f)
+    except:
+        pass
+    _session_metadata[metadata_file] = (mtime_ns, metadata)
+    return metadata
+
+
+# Saves come from the capture loop, its checkpoint writer and the notes API
+_metadata_lock = Lock()
 
 
-def snap(camera, filename):
-    """Starts a process to capture and save an image with the given camera."""
+def save_metadata(metadata_file, metadata):
+    """
+    Write session metadata to metadata_file.
+
+    The JSON is serialized up front and written with a single write() to a
+    temp file that then replaces the old one, so a failed save never leaves
+    a truncated scan_metadata.json behind.
+    """
+    data = json.dumps(metadata, indent=2)
+    with _metadata_lock:
+        _write_text_replacing(metadata_file, data)
+
+
+# Holds at most the latest metadata snapshot waiting to be checkpointed
+_metadata_queue = queue.Queue(maxsize=1)
+
+
+def checkpoint_metadata(metadata_file, metadata):
+    """
+    Save a copy of metadata on the writer thread without waiting for it.
+
+    A snapshot that hasn't been written yet is replaced by the newer one, so
+    the capture loop never blocks on the disk.
+    """
+    try:
+        _metadata_queue.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        _metadata_queue.put_nowait((metadata_file, dict(metadata)))
+    except queue.Full:
+        pass
+
+
+def metadata_writer():
+    """Write queued metadata snapshots until a None is queued."""
+    while True:
+        item = _metadata_queue.get()
+        if item is None:
+            return
+        metadata_file, metadata = item
+        try:
+            save_metadata(metadata_file, metadata)
+        except Exception as e:
+            print(f"WARNING: Could not checkpoint metadata: {e}")
+
+
+def snap(camera, filename, deferred=False, barrier=None):
+    """
+    Start capturing an image with the given camera into filename.
+
+    The capture runs in the camera's persistent gphoto2 shell when one can
+    be opened, otherwise in a one-off gphoto2 process. Either way the
+    returned handle has Popen's poll()/wait()/returncode.
+
+    With deferred, a shell capture leaves the image on the card for
+    download_from_cards() to fetch later. Without a shell the image is
+    always downloaded straight away.
+
+    Captures sharing a barrier hold their shell command until all of them
+    are ready, so the cameras are triggered together rather than one shell
+    start-up or lock wait apart.
+    """
+    shell = open_camera_shell(camera)
+    if shell:
+        return ShellCapture(shell, filename, deferred, barrier)
+    if barrier is not None:
+        # A one-off process can't wait at the barrier; let the other side go
+        barrier.abort()
+    # With close_fds=False and an absolute executable path, subprocess uses
+    # posix_spawn (vfork + exec) instead of forking the whole server process
     return subprocess.Popen(
         [
             GPHOTO,
@@ -978,24 +1677,189 @@ def snap(camera, filename):
             camera,
             "--filename",
             filename,
-        ]
+        ],
+        close_fds=False,
     )
 
 
-def wait(process1, process2):
-    """Wait for the two processes to end."""
-    while process1.poll() is None or process2.poll() is None:
-        time.sleep(0.1)
-    if process1.returncode != 0 or process2.returncode != 0:
+# Single-camera capture keys and the side each one shoots
+SIDES = {"l": "left", "r": "right"}
+
+
+def capture_single(side, port, filename):
+    """
+    Capture filename with just the left or right camera, logging the result
+    and updating the web UI.
+
+    Returns:
+        True if the capture succeeded
+    """
+    logger.debug("Capturing %s camera only (%s)...", side.upper(), port)
+    returncode = finish_capture(snap(port, filename))
+    if returncode != 0:
+        logger.error(
+            "✗ %s camera capture failed with return code: %s",
+            side.capitalize(),
+            returncode,
+        )
+        logger.debug("  Port: %s", port)
+        logger.debug("  Serial: %s", scanner_state[f"{side}_cam_serial"])
         return False
+
+    logger.info("✓ %s camera captured: %s", side.capitalize(), filename)
+    emit_status_update(f"Captured: {filename}", "9f9")
+    emit_gallery_update([filename])
     return True
 
 
+def finish_capture(process, timeout=CAPTURE_TIMEOUT + 5):
+    """
+    Wait for a capture started by snap() and return its exit status.
+
+    A capture that hangs (a camera that stops answering mid-transfer) is
+    killed after timeout seconds and reported as failed, instead of
+    stalling the capture loop for good.
+    """
+    try:
+        return process.wait(timeout=max(timeout, 0))
+    except subprocess.TimeoutExpired:
+        print(f"WARNING: Capture still running after {timeout:.0f}s, stopping it")
+        process.kill()
+        process.wait()
+        return process.returncode or 1
+
+
+def wait(process1, process2):
+    """
+    Wait for the two captures to end, giving up on either after the
+    CAPTURE_TIMEOUT window.
+
+    Both waits block (waitpid for gphoto2 processes, an Event set by the
+    shell reader for ShellCapture) and return as soon as the capture
+    finishes, instead of waking up every 100 ms to poll. The captures run
+    side by side, so they share one deadline.
+    """
+    deadline = time.monotonic() + CAPTURE_TIMEOUT + 5
+    returncode1 = finish_capture(process1, deadline - time.monotonic())
+    returncode2 = finish_capture(process2, deadline - time.monotonic())
+    return returncode1 == 0 and returncode2 == 0
+
+
+# Post-capture rotations run here so the next page can be turned (and
+# captured) while jpegtran finishes the previous pair
+ROTATE_POOL = ThreadPoolExecutor(max_workers=2)
+
+
+def rotate_pair_in_background(pending, rightpic, leftpic):
+    """Queue lossless rotation of a captured pair on ROTATE_POOL."""
+    rotate = tag_jpeg_rotation if EXIF_ONLY_ROTATION else rotate_jpeg
+    futures = [
+        ROTATE_POOL.submit(rotate, rightpic, 270),
+        ROTATE_POOL.submit(rotate, leftpic, 90),
+    ]
+    pending.append(((rightpic, leftpic), futures))
+    for future in futures:
+        future.add_done_callback(_wake_capture_loop)
+
+
+def _wake_capture_loop(future):
+    """Wake wait_for_input() so finish_rotations() can reap the pair."""
+    try:
+        os.write(CAPTURE_TRIGGER_W, ROTATION_WAKE)
+    except BlockingIOError:
+        pass  # The loop has plenty of wake-ups queued already
+
+
+def finish_rotations(pending, block=False):
+    """
+    Reap queued rotations, announcing each pair once both images are done.
+
+    Without block only pairs that have already finished are reaped, so this
+    can be called every time round the key loop. With block it waits for
+    all of them, e.g. before a capture that may overwrite a queued file.
+    """
+    finished = []
+    while pending:
+        pics, futures = pending[0]
+        if not block and not all(f.done() for f in futures):
+            break
+        pending.popleft()
+        for pic, future in zip(pics, futures):
+            if not future.result():
+                print(f"WARNING: Could not rotate {pic}")
+        emit_status_update(f"Captured: {pics[0]}, {pics[1]}", "9f9")
+        finished.extend(pics)
+    if finished:
+        emit_gallery_update(finished)
+
+
+def usb_device_signature():
+    """
+    Cheap fingerprint of the attached USB devices.
+
+    Listing /dev/bus/usb takes microseconds where a gphoto2 auto-detect and
+    serial query takes most of a second, so the capture loop compares this
+    before each shot to notice a replugged or re-enumerated camera (the
+    kernel gives a device a new number every time it's enumerated). Where
+    the directory doesn't exist (macOS) the signature never changes and
+    re-detection only happens after a failed capture.
+
+    Returns:
+        frozenset of (bus, device) numbers, as in gphoto2's usb:BBB,DDD ports
+    """
+    devices = set()
+    try:
+        with os.scandir("/dev/bus/usb") as buses:
+            for bus in buses:
+                with os.scandir(bus.path) as nodes:
+                    devices.update((bus.name, node.name) for node in nodes)
+    except OSError:
+        pass
+    return frozenset(devices)
+
+
+# Serial mode's pause between shots: USB devices must have stayed unchanged
+# for USB_SETTLE_QUIET seconds, and the pause never exceeds USB_SETTLE_MAX
+USB_SETTLE_QUIET = 0.2
+USB_SETTLE_MAX = 1.0
+
+
+def wait_for_usb_settle():
+    """
+    Wait until no USB device has come or gone for USB_SETTLE_QUIET seconds.
+
+    A camera that re-enumerates after a capture shows up as its device node
+    changing, so the wait is extended while that happens and is otherwise
+    over in a fraction of the old fixed second. Without /dev/bus/usb there
+    is nothing to watch and the full USB_SETTLE_MAX is waited.
+
+    Returns:
+        The settled usb_device_signature()
+    """
+    deadline = time.monotonic() + USB_SETTLE_MAX
+    signature = usb_device_signature()
+    if not signature:
+        time.sleep(USB_SETTLE_MAX)
+        return signature
+    quiet_until = time.monotonic() + USB_SETTLE_QUIET
+    while True:
+        now = time.monotonic()
+        if now >= quiet_until or now >= deadline:
+            return signature
+        time.sleep(min(0.05, deadline - now))
+        current = usb_device_signature()
+        if current != signature:
+            signature = current
+            quiet_until = time.monotonic() + USB_SETTLE_QUIET
+
+
 def get_cameras():
     """Detect and return the two camera ports."""
     try:
-        gphoto_output = subprocess.check_output([GPHOTO, "--auto-detect"]).decode()
-        cameras = re.findall(r"usb:\d*,\d*", gphoto_output)
+        gphoto_output = subprocess.check_output(
+            [GPHOTO, "--auto-detect"], errors="replace"
+        )
+        cameras = USB_PORT.findall(gphoto_output)
         if len(cameras) == 2:
             return cameras
     except Exception as e:
@@ -1005,8 +1869,6 @@ def get_cameras():
 
 def start_web_server():
     """Start Flask-SocketIO server in background."""
-    import logging
-
     log = logging.getLogger("werkzeug")
     log.setLevel(logging.ERROR)
     log = logging.getLogger("socketio")
@@ -1020,44 +1882,61 @@ def start_web_server():
     )
 
 
-def getch_nonblocking():
-    """Get a single character without blocking (non-blocking mode)."""
+def wait_for_input(timeout=None):
+    """
+    Block until a key is pressed, the web interface requests a capture or a
+    background rotation finishes.
+
+    Expects stdin to already be in cbreak mode. Web requests that arrive
+    together are coalesced into one capture, as a single button press would.
+
+    Returns:
+        (key, from_web) - key is CAPTURE_KEY for web requests, or None if
+        only rotations finished (or timeout passed with no input)
+    """
     fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    try:
-        # Set raw mode and disable echo
-        tty.setraw(sys.stdin.fileno())
-        new_settings = termios.tcgetattr(fd)
-        new_settings[3] = new_settings[3] & ~termios.ECHO  # Disable echo
-        termios.tcsetattr(fd, termios.TCSADRAIN, new_settings)
-
-        # Check if input is available
-        rlist, _, _ = select.select([sys.stdin], [], [], 0.1)
-        if rlist:
-            ch = sys.stdin.read(1)
-            return ch
-        return None
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    rlist, _, _ = select.select([CAPTURE_TRIGGER_R, fd], [], [], timeout)
+    if CAPTURE_TRIGGER_R in rlist:
+        if os.read(CAPTURE_TRIGGER_R, 512).strip(ROTATION_WAKE):
+            return CAPTURE_KEY, True
+    if fd in rlist:
+        return os.read(fd, 1).decode(errors="replace"), False
+    return None, False
+
+
+def write_cue(cue):
+    """
+    Write preencoded bytes straight to stdout's byte stream.
+
+    The text layer is flushed first so the cue lands after anything already
+    printed, and the cue itself is flushed so it shows up right away.
+    """
+    sys.stdout.flush()
+    sys.stdout.buffer.write(cue)
+    sys.stdout.buffer.flush()
 
 
 def getch_blocking():
-    """Get a single character with blocking (wait for input)."""
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    try:
-        # Set raw mode and disable echo (except for visible feedback during number entry)
-        tty.setraw(sys.stdin.fileno())
-        ch = sys.stdin.read(1)
-        return ch
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    """
+    Get a single character, waiting for it.
+
+    Expects stdin to already be in cbreak mode (the capture loop sets it up
+    once), so no terminal settings are read or changed per key.
+    """
+    return os.read(sys.stdin.fileno(), 1).decode(errors="replace")
 
 
 # Main execution
 if __name__ == "__main__":
     from datetime import datetime
 
+    # SCANNER_DEBUG=1 brings back the per-capture detail
+    logging.basicConfig(
+        level=logging.DEBUG if os.environ.get("SCANNER_DEBUG") else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+
     # Prompt for project information
     print("=" * 60)
     print("Book Scanner - Project Setup")
@@ -1096,18 +1975,26 @@ if __name__ == "__main__":
     os.chdir(session_dir)
     print(f"✓ Working directory: {os.getcwd()}\n")
 
-    # Kill processes that interfere with camera access
-    devnull = open(os.devnull, "w")
-    # Mac
-    subprocess.call(["killall", "PTPCamera"], stderr=devnull)
-    # Linux - GVFS processes
-    subprocess.call(["killall", "gvfs-gphoto2-volume-monitor"], stderr=devnull)
-    subprocess.call(["killall", "gvfs-mtp-volume-monitor"], stderr=devnull)
-    subprocess.call(["killall", "gvfsd-gphoto2"], stderr=devnull)
-    devnull.close()
+    # Kill processes that interfere with camera access: PTPCamera on Mac,
+    # the GVFS gphoto2/MTP volume monitors and gvfsd-gphoto2 on Linux. Linux
+    # truncates process names to 15 characters, hence the open-ended names
+    camera_grabbers = "PTPCamera|gvfs-gphoto2-vo.*|gvfs-mtp-volume.*|gvfsd-gphoto2"
+    subprocess.call(
+        ["pkill", "-x", camera_grabbers],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
-    # Give processes time to die
-    time.sleep(0.5)
+    # Give processes time to die, but stop waiting as soon as they're gone
+    deadline = time.monotonic() + 0.5
+    while time.monotonic() < deadline:
+        if subprocess.call(
+            ["pgrep", "-x", camera_grabbers],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ):
+            break
+        time.sleep(0.02)
 
     # Start web server in background
     server_thread = Thread(target=start_web_server, daemon=True)
@@ -1115,10 +2002,12 @@ if __name__ == "__main__":
     print(f"📡 Web server running at http://localhost:{PORT}")
     print("Open this URL in your browser to see live scanner updates\n")
 
-    # Detect cameras and get serials (with retry loop)
+    # Detect cameras and get serials (with retry loop). Cameras found on an
+    # earlier attempt are remembered, so a retry only queries new ports
+    port_serial_map = {}
     while True:
         print("Detecting cameras...")
-        port_serial_map = get_all_camera_serials()
+        port_serial_map = get_all_camera_serials(known=port_serial_map)
 
         if len(port_serial_map) == 2:
             break
@@ -1173,7 +2062,7 @@ if __name__ == "__main__":
     scanner_state["left_cam_port"] = left_cam
     scanner_state["right_cam_port"] = right_cam
 
-    # Get initial battery levels
+    # Get initial battery levels (and model info for the metadata below)
     camera_info_map = scanner_state.get("camera_info_map", {})
     left_cam_info = camera_info_map.get(left_cam, {})
     right_cam_info = camera_info_map.get(right_cam, {})
@@ -1184,25 +2073,29 @@ if __name__ == "__main__":
     if scanner_state["right_cam_battery"] is not None:
         print(f"Right camera battery: {scanner_state['right_cam_battery']}%")
 
+    # Keep a gphoto2 shell open per camera so captures don't pay gphoto2's
+    # start-up and USB claim each time
+    for port in (left_cam, right_cam):
+        if open_camera_shell(port):
+            print(f"✓ Camera shell ready on {port}")
+        else:
+            print(f"WARNING: No gphoto2 shell on {port}, using one process per capture")
+
     # Capture preview images
     print("Skipping preview - going straight to scanning")
     scanner_state["status_color"] = "9f9"
     scanner_state["status_text"] = "Ready to scan"
 
-    # Save metadata to JSON file
-    # Get camera info from the stored map
-    camera_info_map = scanner_state.get("camera_info_map", {})
-    left_cam_info = camera_info_map.get(left_cam, {})
-    right_cam_info = camera_info_map.get(right_cam, {})
-
+    # Save metadata to JSON file, reusing the camera info looked up above
+    start_iso = scan_start_time.isoformat()
     metadata = {
         "session_name": session_name,
         "identifier": identifier,
         "magazine_name": magazine_name,
         "scanner_person": scanner_person,
-        "scan_date": scan_start_time.strftime("%Y-%m-%d"),
-        "scan_time": scan_start_time.strftime("%H:%M:%S"),
-        "scan_start_timestamp": scan_start_time.isoformat(),
+        "scan_date": start_iso[:10],  # YYYY-MM-DD
+        "scan_time": start_iso[11:19],  # HH:MM:SS
+        "scan_start_timestamp": start_iso,
         "left_camera": {
             "port": left_cam,
             "serial": left_serial,
@@ -1219,8 +2112,7 @@ if __name__ == "__main__":
 
     metadata_file = "scan_metadata.json"
     try:
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        save_metadata(metadata_file, metadata)
         print(f"\n✓ Metadata saved to {metadata_file}")
     except Exception as e:
         print(f"WARNING: Could not save metadata: {e}")
@@ -1239,25 +2131,37 @@ if __name__ == "__main__":
 
     print(f"\nReady. Press '{CAPTURE_KEY}' to capture both cameras")
     print(
-        f"Commands: l/r=left/right only, s=toggle serial/parallel, q=toggle serial query, n=image number, x=quit\n"
+        f"Commands: l/r=left/right only, s=toggle serial/parallel, q=toggle serial query, d=toggle deferred download, n=image number, x=quit\n"
     )
 
+    pending_rotations = deque()
+    deferred_download = False  # Leave captures on the cards until later
+    deferred_pairs = []
+    checkpoint_thread = Thread(target=metadata_writer, daemon=True)
+    checkpoint_thread.start()
+    usb_signature = usb_device_signature()
+    rescan_cameras = False
+    serial_port_map = {v: k for k, v in port_serial_map.items()}
+
+    # Read keys one at a time without echo for the whole loop. cbreak keeps
+    # Ctrl+C as SIGINT and leaves output processing alone
+    stdin_settings = termios.tcgetattr(sys.stdin.fileno())
+    tty.setcbreak(sys.stdin.fileno())
+
     try:
         while True:
-            # Check for web-triggered capture
-            if scanner_state["capture_requested"]:
-                scanner_state["capture_requested"] = False
-                x = CAPTURE_KEY  # Simulate 'b' press from web
-                print(f"[Web trigger: {x}]")
-            else:
-                # Non-blocking input - check for keypresses
-                ch = getch_nonblocking()
+            finish_rotations(pending_rotations)
 
-                if ch is None:
-                    # No input, continue loop
-                    time.sleep(0.05)
-                    continue
+            # Sleep until a key or web trigger arrives. Queued rotations
+            # wake the loop as they finish, so they're announced right away
+            ch, from_web = wait_for_input()
+            if ch is None:
+                continue
 
+            if from_web:
+                x = ch  # Simulate 'b' press from web
+                print(f"[Web trigger: {x}]")
+            else:
                 # Handle special characters
                 if ch == "\r" or ch == "\n":
                     ch = ""  # Treat Enter as empty string
@@ -1277,6 +2181,22 @@ if __name__ == "__main__":
                 print(f"\nSwitched to {mode} capture mode")
                 continue
 
+            if x == "d":  # toggle leaving captures on the cards until later
+                if deferred_download:
+                    download_from_cards(deferred_pairs, pending_rotations)
+                card = not deferred_download
+                if all(set_capture_target(p, card) for p in (left_cam, right_cam)):
+                    deferred_download = card
+                else:
+                    for port in (left_cam, right_cam):
+                        set_capture_target(port, deferred_download)
+                if deferred_download:
+                    print("\nDeferred download: captures stay on the cards until")
+                    print("  'd' is pressed again or the session ends")
+                else:
+                    print("\nDownloading each capture as it's taken")
+                continue
+
             if x == "q":  # toggle serial query before capture
                 query_serials_before_capture = not query_serials_before_capture
                 status = "enabled" if query_serials_before_capture else "disabled"
@@ -1302,229 +2222,181 @@ if __name__ == "__main__":
                 try:
                     new_num = int(num_str)
                     img_num = new_num // 2 * 2  # convert to even number
+                    # Recapturing may overwrite images still being rotated
+                    finish_rotations(pending_rotations, block=True)
                     print(f"Next image will be {img_num}")
                 except ValueError:
                     print("Invalid number")
                 continue
 
-            if x == "l":  # capture left camera only
-                if query_serials_before_capture:
-                    port_serial_map = get_all_camera_serials()
-                else:
-                    port_serial_map = get_all_camera_serials()
-                left_cam = None
-                for port, serial in port_serial_map.items():
-                    if serial == scanner_state["left_cam_serial"]:
-                        left_cam = port
-
-                if not left_cam:
-                    print("ERROR: Could not find left camera.")
-                    print(f"  Expected serial: {scanner_state['left_cam_serial']}")
-                    print(f"  Available ports: {port_serial_map}")
-                    continue
-
-                print(f"Capturing LEFT camera only ({left_cam})...")
-                cmd = [
-                    GPHOTO,
-                    "--capture-image-and-download",
-                    "--force-overwrite",
-                    "--port",
-                    left_cam,
-                    "--filename",
-                    IMG_FORMAT % img_num,
-                ]
-                print(f"  Command: {' '.join(cmd)}")
-                p1 = snap(left_cam, IMG_FORMAT % img_num)
-                returncode = p1.wait()
-                if returncode == 0:
-                    print(f"✓ Left camera captured: {IMG_FORMAT % img_num}")
-                    emit_status_update(f"Captured: {IMG_FORMAT % img_num}", "9f9")
-                    emit_gallery_update()
-                    img_num += 1
-                else:
-                    print(
-                        f"✗ Left camera capture failed with return code: {returncode}"
-                    )
-                    print(f"  Port: {left_cam}")
-                    print(f"  Serial: {scanner_state['left_cam_serial']}")
-                continue
-
-            if x == "r":  # capture right camera only
-                if query_serials_before_capture:
-                    port_serial_map = get_all_camera_serials()
-                else:
+            # Reuse the ports found at startup unless asked to re-query, the
+            # last capture failed, or the USB devices have changed
+            if x in SIDES or x in ("", CAPTURE_KEY):
+                usb_now = usb_device_signature()
+                if (
+                    query_serials_before_capture
+                    or rescan_cameras
+                    or usb_now != usb_signature
+                ):
+                    print("Querying camera serials...")
                     port_serial_map = get_all_camera_serials()
-                right_cam = None
-                for port, serial in port_serial_map.items():
-                    if serial == scanner_state["right_cam_serial"]:
-                        right_cam = port
-
-                if not right_cam:
-                    print("ERROR: Could not find right camera.")
-                    print(f"  Expected serial: {scanner_state['right_cam_serial']}")
-                    print(f"  Available ports: {port_serial_map}")
+                    serial_port_map = {v: k for k, v in port_serial_map.items()}
+                    usb_signature = usb_now
+                    rescan_cameras = False
+
+            if x in SIDES:  # capture left or right camera only
+                side = SIDES[x]
+                serial = scanner_state[f"{side}_cam_serial"]
+                cam = serial_port_map.get(serial)
+                if not cam:
+                    logger.error("ERROR: Could not find %s camera.", side)
+                    logger.info("  Expected serial: %s", serial)
+                    logger.info("  Available ports: %s", port_serial_map)
+                    rescan_cameras = True
                     continue
 
-                print(f"Capturing RIGHT camera only ({right_cam})...")
-                cmd = [
-                    GPHOTO,
-                    "--capture-image-and-download",
-                    "--force-overwrite",
-                    "--port",
-                    right_cam,
-                    "--filename",
-                    IMG_FORMAT % img_num,
-                ]
-                print(f"  Command: {' '.join(cmd)}")
-                p1 = snap(right_cam, IMG_FORMAT % img_num)
-                returncode = p1.wait()
-                if returncode == 0:
-                    print(f"✓ Right camera captured: {IMG_FORMAT % img_num}")
-                    emit_status_update(f"Captured: {IMG_FORMAT % img_num}", "9f9")
-                    emit_gallery_update()
+                if capture_single(side, cam, IMG_FORMAT % img_num):
                     img_num += 1
                 else:
-                    print(
-                        f"✗ Right camera capture failed with return code: {returncode}"
-                    )
-                    print(f"  Port: {right_cam}")
-                    print(f"  Serial: {scanner_state['right_cam_serial']}")
+                    rescan_cameras = True
                 continue
 
             if x == "" or x == CAPTURE_KEY:  # Empty input or 'b' = capture both cameras
-                print(f"\n[Capture #{img_num // 2 + 1}]", flush=True)
-
-                # Optionally re-query serials before capture
-                if query_serials_before_capture:
-                    print("Querying camera serials...")
-                    port_serial_map = get_all_camera_serials()
-                else:
-                    # Just use the stored serials and find current ports
-                    port_serial_map = get_all_camera_serials()
+                logger.info("\n[Capture #%d]", img_num // 2 + 1)
+                # The left camera shoots the right-hand page and vice versa
+                rightpic = IMG_FORMAT % img_num
+                leftpic = IMG_FORMAT % (img_num + 1)
 
-                left_cam = None
-                right_cam = None
-                for port, serial in port_serial_map.items():
-                    if serial == scanner_state["left_cam_serial"]:
-                        left_cam = port
-                    elif serial == scanner_state["right_cam_serial"]:
-                        right_cam = port
+                left_cam = serial_port_map.get(scanner_state["left_cam_serial"])
+                right_cam = serial_port_map.get(scanner_state["right_cam_serial"])
 
                 if not left_cam or not right_cam:
-                    print("ERROR: Could not find both cameras.")
-                    print(f"  Expected left: {scanner_state['left_cam_serial']}")
-                    print(f"  Expected right: {scanner_state['right_cam_serial']}")
-                    print(f"  Available: {port_serial_map}")
+                    logger.error("ERROR: Could not find both cameras.")
+                    logger.info("  Expected left: %s", scanner_state["left_cam_serial"])
+                    logger.info("  Expected right: %s", scanner_state["right_cam_serial"])
+                    logger.info("  Available: %s", port_serial_map)
+                    rescan_cameras = True
                     continue
 
                 # Check if ports have shifted and update display
                 ports = list(port_serial_map.keys())
                 if ports != previous_cameras:
-                    print(f"⚠️  Camera ports shifted: {previous_cameras} → {ports}")
-                    print(f"   Left={left_cam}, Right={right_cam}")
+                    logger.warning(
+                        "⚠️  Camera ports shifted: %s → %s", previous_cameras, ports
+                    )
+                    logger.warning("   Left=%s, Right=%s", left_cam, right_cam)
                     previous_cameras = ports
                     scanner_state["left_cam_port"] = left_cam
                     scanner_state["right_cam_port"] = right_cam
 
                 if use_parallel:
                     # Try parallel capture
-                    print(f"Capturing BOTH cameras in parallel mode...")
-                    print(f"  LEFT: {left_cam}")
-                    print(f"  RIGHT: {right_cam}")
+                    logger.debug("Capturing BOTH cameras in parallel mode...")
+                    logger.debug("  LEFT: %s", left_cam)
+                    logger.debug("  RIGHT: %s", right_cam)
                     emit_status_update("Capturing both cameras...", "ff9")
 
-                    p1 = snap(left_cam, IMG_FORMAT % img_num)
-                    p2 = snap(right_cam, IMG_FORMAT % (img_num + 1))
+                    barrier = Barrier(2, timeout=CAPTURE_SYNC_TIMEOUT)
+                    p1 = snap(left_cam, rightpic, deferred_download, barrier)
+                    p2 = snap(right_cam, leftpic, deferred_download, barrier)
 
                     # Wait for both to complete
                     success = wait(p1, p2)
 
                     if success:
-                        print(f"✓ Both captures successful")
+                        logger.debug("✓ Both captures successful")
                     else:
-                        print(
-                            f"✗ Parallel capture failed (left={p1.returncode}, right={p2.returncode})"
+                        logger.error(
+                            "✗ Parallel capture failed (left=%s, right=%s)",
+                            p1.returncode,
+                            p2.returncode,
                         )
-                        print(
-                            f"  Hint: Use 's' to switch to serial mode if parallel isn't working"
+                        logger.info(
+                            "  Hint: Use 's' to switch to serial mode if parallel isn't working"
                         )
+                        rescan_cameras = True
                         continue
                 else:
                     # Serial capture mode
-                    print(f"Capturing LEFT: {left_cam}")
-                    p1 = snap(left_cam, IMG_FORMAT % img_num)
-                    returncode1 = p1.wait()
+                    logger.debug("Capturing LEFT: %s", left_cam)
+                    p1 = snap(left_cam, rightpic, deferred_download)
+                    returncode1 = finish_capture(p1)
                     if returncode1 == 0:
-                        print(f"✓ Left capture successful: {IMG_FORMAT % img_num}")
+                        logger.debug("✓ Left capture successful: %s", rightpic)
                     else:
-                        print(
-                            f"✗ Left camera capture failed with return code: {returncode1}"
+                        logger.error(
+                            "✗ Left camera capture failed with return code: %s", returncode1
                         )
-                        print(
-                            f"  Port: {left_cam}, Serial: {scanner_state['left_cam_serial']}"
+                        logger.info(
+                            "  Port: %s, Serial: %s",
+                            left_cam,
+                            scanner_state["left_cam_serial"],
                         )
+                        rescan_cameras = True
                         continue
 
                     # Wait for USB to settle
-                    print("Waiting for USB to settle...")
-                    time.sleep(1.0)
+                    logger.debug("Waiting for USB to settle...")
+                    usb_now = wait_for_usb_settle()
 
-                    # Re-detect before second camera if querying serials
-                    if query_serials_before_capture:
+                    # Re-detect before second camera if querying serials,
+                    # but only if the first capture changed the USB devices;
+                    # otherwise the map queried just before it still holds
+                    if query_serials_before_capture and usb_now != usb_signature:
                         port_serial_map = get_all_camera_serials()
-                        right_cam = None
-                        for port, serial in port_serial_map.items():
-                            if serial == scanner_state["right_cam_serial"]:
-                                right_cam = port
-
+                        serial_port_map = {v: k for k, v in port_serial_map.items()}
+                        usb_signature = usb_now
+                        right_cam = serial_port_map.get(scanner_state["right_cam_serial"])
                         if not right_cam:
-                            print(
+                            logger.error(
                                 "ERROR: Could not find right camera before second capture."
                             )
-                            print(
-                                f"  Expected serial: {scanner_state['right_cam_serial']}"
+                            logger.info(
+                                "  Expected serial: %s", scanner_state["right_cam_serial"]
                             )
-                            print(f"  Available: {port_serial_map}")
+                            logger.info("  Available: %s", port_serial_map)
                             continue
 
                     # Capture right camera
-                    print(f"Capturing RIGHT: {right_cam}")
-                    p2 = snap(right_cam, IMG_FORMAT % (img_num + 1))
-                    returncode2 = p2.wait()
+                    logger.debug("Capturing RIGHT: %s", right_cam)
+                    p2 = snap(right_cam, leftpic, deferred_download)
+                    returncode2 = finish_capture(p2)
                     if returncode2 == 0:
-                        print(
-                            f"✓ Right capture successful: {IMG_FORMAT % (img_num + 1)}"
-                        )
+                        logger.debug("✓ Right capture successful: %s", leftpic)
                     else:
-                        print(
-                            f"✗ Right camera capture failed with return code: {returncode2}"
+                        logger.error(
+                            "✗ Right camera capture failed with return code: %s", returncode2
                         )
-                        print(
-                            f"  Port: {right_cam}, Serial: {scanner_state['right_cam_serial']}"
+                        logger.info(
+                            "  Port: %s, Serial: %s",
+                            right_cam,
+                            scanner_state["right_cam_serial"],
                         )
+                        rescan_cameras = True
                         continue
 
                 # Auto-rotate images
-                rightpic = "img" + str(img_num).zfill(5) + ".jpg"
-                leftpic = "img" + str(img_num + 1).zfill(5) + ".jpg"
-                os.system("jpegtran -rot 270 " + rightpic + " > opt-" + rightpic)
-                os.system("cp opt-" + rightpic + " " + rightpic)
-                os.system("rm opt-" + rightpic)
-                os.system("jpegtran -rot 90 " + leftpic + " > opt-" + leftpic)
-                os.system("cp opt-" + leftpic + " " + leftpic)
-                os.system("rm opt-" + leftpic)
-
-                # Update image list and status
-                emit_status_update(f"Captured: {rightpic}, {leftpic}", "9f9")
-                emit_gallery_update()
-                print(f"✓ Saved: {rightpic}, {leftpic}")
-                print(f"Ready.\n")
+                if deferred_download:
+                    deferred_pairs.append((rightpic, leftpic))
+                    emit_status_update(
+                        f"Captured to cards: {rightpic}, {leftpic}", "9f9"
+                    )
+                    logger.info("✓ On camera cards: %s, %s", rightpic, leftpic)
+                else:
+                    rotate_pair_in_background(pending_rotations, rightpic, leftpic)
+                    logger.info("✓ Saved: %s, %s", rightpic, leftpic)
+                if logger.isEnabledFor(logging.INFO):
+                    write_cue(READY_CUE)
 
                 img_num += 2
+                if img_num % (2 * METADATA_CHECKPOINT_PAGES) == 0:
+                    metadata["total_images_captured"] = img_num
+                    checkpoint_metadata(metadata_file, metadata)
                 continue
 
             try:  # assume x is an image number to jump to
                 img_num = int(x) // 2 * 2  # convert to even number
+                finish_rotations(pending_rotations, block=True)
             except ValueError:
                 print("unrecognized command")
                 continue
@@ -1533,6 +2405,19 @@ if __name__ == "__main__":
         print("\n\nInterrupted by keyboard (Ctrl+C)")
 
     finally:
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, stdin_settings)
+        if deferred_download:
+            download_from_cards(deferred_pairs, pending_rotations)
+            for port in (left_cam, right_cam):
+                set_capture_target(port, False)
+        close_camera_shells()
+        finish_rotations(pending_rotations, block=True)
+        ROTATE_POOL.shutdown(wait=True)
+
+        # Let any pending checkpoint land before the final write replaces it
+        _metadata_queue.put(None)
+        checkpoint_thread.join()
+
         # Save stop time to metadata
         scan_stop_time = datetime.now()
         duration_seconds = (scan_stop_time - scan_start_time).total_seconds()
@@ -1540,12 +2425,6 @@ if __name__ == "__main__":
         metadata["scan_duration_seconds"] = duration_seconds
         metadata["total_images_captured"] = img_num
 
-        try:
-            with open(metadata_file, "w") as f:
-                json.dump(metadata, f, indent=2)
-        except Exception as e:
-            print(f"WARNING: Could not update metadata: {e}")
-
         # Print session summary
         duration_mins = int(duration_seconds // 60)
         duration_secs = int(duration_seconds % 60)
@@ -1577,13 +2456,16 @@ if __name__ == "__main__":
             new_notes = input("> ").strip()
             if new_notes:
                 metadata["notes"] = new_notes
-                try:
-                    with open(metadata_file, "w") as f:
-                        json.dump(metadata, f, indent=2)
-                    print(f"Notes saved.")
-                except Exception as e:
-                    print(f"WARNING: Could not save notes: {e}")
             elif current_notes:
                 print("Notes unchanged.")
         except (EOFError, KeyboardInterrupt):
+            new_notes = ""
             print("\nSkipping notes.")
+
+        # Stop time, counts and notes all go out in one final write
+        try:
+            save_metadata(metadata_file, metadata)
+            if new_notes:
+                print(f"Notes saved.")
+        except Exception as e:
+            print(f"WARNING: Could not update metadata: {e}")
@@ -8,6 +8,7 @@ const DEBOUNCE_MS = 500; // Minimum time between captures in milliseconds
 
 // Initialize Socket.IO connection
 const socket = io();
+let socketConnectedBefore = false;
 
 function formatBytes(bytes) {
   if (bytes === 0) return "0 B";
@@ -85,6 +86,13 @@ function triggerCapture() {
 
 socket.on("connect", function () {
   console.log("WebSocket connected");
+  // Captures only arrive as gallery_append deltas, so any sent while
+  // disconnected were missed; reload the whole gallery after a reconnect
+  if (socketConnectedBefore) {
+    previousImageCount = 0;
+    updateGallery();
+  }
+  socketConnectedBefore = true;
 });
 
 socket.on("disconnect", function () {
@@ -96,22 +104,56 @@ socket.on("status_update", function (data) {
   document.body.style.backgroundColor = "#" + data.color;
 });
 
-socket.on("gallery_update", function (data) {
+socket.on("gallery_append", function (data) {
   if (!currentViewingSession) {
     document.getElementById("image-count").textContent = data.image_count;
 
-    // Update gallery with reversed images (most recent first)
+    // Merge just the new captures into the gallery, keeping it sorted most
+    // recent first; a recaptured image replaces its old entry
     let gallery = document.getElementById("gallery");
-    let galleryHTML = "";
-    for (let img of data.images.slice().reverse()) {
-      galleryHTML += buildImageHTML(img, "");
+    for (let img of data.images) {
+      let template = document.createElement("template");
+      template.innerHTML = buildImageHTML(img, "").trim();
+      let item = template.content.firstChild;
+
+      let existing = gallery.querySelector(
+        `.image-item[data-filename="${img.filename}"]`,
+      );
+      if (existing) {
+        existing.replaceWith(item);
+        continue;
+      }
+      let next = Array.from(gallery.children).find(
+        (el) => el.dataset.filename < img.filename,
+      );
+      gallery.insertBefore(item, next || null);
     }
-    gallery.innerHTML = galleryHTML;
     previousImageCount = data.image_count;
   }
 });
 
 function buildImageHTML(img, sessionPrefix) {
+  // Session listings only carry filename and size; mark those items so
+  // their EXIF can be fetched once they scroll into view
+  let lazyAttrs = "";
+  if (img.width === undefined && sessionPrefix) {
+    lazyAttrs = ` data-session="${sessionPrefix.slice(1)}"`;
+  }
+  // The mtime in the URL lets the browser cache each version of an image,
+  // and makes a recaptured image load fresh instead of from cache
+  let version = img.mtime ? `?v=${img.mtime}` : "";
+
+  return `
+      <div class="image-item" data-filename="${img.filename}"${lazyAttrs}>
+          <img src="${sessionPrefix}/img/${img.filename}${version}" alt="${img.filename}">
+          <div class="fileinfo">
+              <div class="meta-row"><strong>${img.filename}</strong> (${img.size})</div>
+              <div class="exif-info">${buildExifHTML(img)}</div>
+          </div>
+      </div>`;
+}
+
+function buildExifHTML(img) {
   let exifHTML = "";
 
   if (img.width && img.height) {
@@ -131,16 +173,24 @@ function buildImageHTML(img, sessionPrefix) {
     exifHTML += `<div class="exif-data">${settings.join(" • ")}</div>`;
   }
 
-  return `
-      <div class="image-item">
-          <img src="${sessionPrefix}/img/${img.filename}" alt="${img.filename}">
-          <div class="fileinfo">
-              <div class="meta-row"><strong>${img.filename}</strong> (${img.size})</div>
-              ${exifHTML}
-          </div>
-      </div>`;
+  return exifHTML;
 }
 
+// Fetch EXIF for lazily listed session images as they become visible
+const exifObserver = new IntersectionObserver((entries) => {
+  for (let entry of entries) {
+    if (!entry.isIntersecting) continue;
+    let item = entry.target;
+    exifObserver.unobserve(item);
+    fetch(`/api/image-exif/${item.dataset.session}/${item.dataset.filename}`)
+      .then((r) => r.json())
+      .then((img) => {
+        item.querySelector(".exif-info").innerHTML = buildExifHTML(img);
+      })
+      .catch((e) => console.log("Error loading image EXIF:", e));
+  }
+});
+
 function formatBatteryLevel(level) {
   if (level === null || level === undefined) {
     return "";
@@ -287,6 +337,9 @@ function viewSession(sessionName) {
       }
 
       gallery.innerHTML = galleryHTML;
+      for (let item of gallery.querySelectorAll(".image-item[data-session]")) {
+        exifObserver.observe(item);
+      }
       document.getElementById("session-name").textContent =
         sessionName + " (Viewing)";
     })
@@ -0,0 +1,303 @@
+"""Tests for process.py (run with `python -m unittest discover tests`)."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image, ImageChops, ImageStat, PdfParser
+
+import process
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp, name)
+
+
+class CreatePdfTests(TempDirTestCase):
+    def _first_page(self, pdf_path):
+        """Return (page dict, image XObject stream) of a PDF's first page."""
+        pdf = PdfParser.PdfParser(pdf_path)
+        self.addCleanup(pdf.close)
+        page = pdf.read_indirect(pdf.pages[0])
+        image = pdf.read_indirect(page[b"Resources"][b"XObject"][b"image"])
+        return page, image
+
+    def _check_downscaled(self, source, downscale):
+        output = self.path(f"out-{downscale}.pdf")
+        self.assertTrue(process.create_pdf([source], output, downscale=downscale))
+        page, image = self._first_page(output)
+
+        # The XObject must describe the stream it wraps...
+        _, encoded_size = process.scan_jpeg_header(bytes(image.buf))
+        self.assertEqual(
+            (image.dictionary.Width, image.dictionary.Height), encoded_size
+        )
+        self.assertEqual(encoded_size, (1000 // downscale, 800 // downscale))
+        # ...while the page keeps its full-resolution size
+        self.assertEqual(
+            page[b"MediaBox"], [0, 0, 1000 * 72 / 300, 800 * 72 / 300]
+        )
+
+    def test_downscaled_jpeg_declares_encoded_size(self):
+        source = self.path("page.jpg")
+        Image.new("RGB", (1000, 800), "white").save(source)
+        for downscale in (2, 3):
+            with self.subTest(downscale=downscale):
+                self._check_downscaled(source, downscale)
+
+    def test_downscaled_png_declares_encoded_size(self):
+        source = self.path("page.png")
+        Image.new("RGBA", (1000, 800), "white").save(source)
+        self._check_downscaled(source, 2)
+
+    def test_verbatim_jpeg_keeps_its_size(self):
+        source = self.path("page.jpg")
+        Image.new("RGB", (1000, 800), "white").save(source)
+        output = self.path("out.pdf")
+        self.assertTrue(process.create_pdf([source], output))
+        _, image = self._first_page(output)
+        self.assertEqual((image.dictionary.Width, image.dictionary.Height), (1000, 800))
+
+
+def save_tagged_jpeg(path, size, orientation):
+    """Save a JPEG of size carrying an EXIF Orientation (and a Make tag)."""
+    img = Image.new("RGB", size, "white")
+    exif = img.getexif()
+    exif[process.EXIF_ORIENTATION] = orientation
+    exif[271] = "TestCam"
+    img.save(path, exif=exif)
+
+
+@unittest.skipUnless(process.JPEGTRAN, "jpegtran is not installed")
+class RotateJpegTests(TempDirTestCase):
+    def test_rotation_resets_camera_orientation(self):
+        source = self.path("img00000.jpg")
+        save_tagged_jpeg(source, (640, 480), orientation=6)
+
+        self.assertTrue(process.rotate_jpeg(source, 90))
+
+        self.assertEqual(process.get_jpeg_size(source), (480, 640))
+        # The pixels are upright now, so nothing may rotate them again...
+        self.assertEqual(process.get_jpeg_orientation(source), 1)
+        # ...but the rest of the camera's EXIF is kept
+        with Image.open(source) as img:
+            self.assertEqual(img.getexif().get(271), "TestCam")
+
+
+class OrientationTests(TempDirTestCase):
+    def test_preview_leaves_tagged_capture_alone(self):
+        source = self.path("img00000.jpg")
+        save_tagged_jpeg(source, (640, 480), orientation=6)
+        with open(source, "rb") as f:
+            original = f.read()
+
+        self.assertEqual(process.get_upright_size(source), (480, 640))
+        preview = process.preview_crop(source, (0, 0, 480, 640))
+
+        with open(source, "rb") as f:
+            self.assertEqual(f.read(), original)
+        with Image.open(preview) as img:
+            self.assertLess(img.width, img.height)
+
+    def test_concurrent_flatten_rotates_once(self):
+        source = self.path("img00000.jpg")
+        save_tagged_jpeg(source, (640, 480), orientation=6)
+
+        with process.ThreadPoolExecutor(max_workers=4) as pool:
+            changed = list(pool.map(process.flatten_orientation, [source] * 4))
+
+        self.assertEqual(changed.count(True), 1)
+        self.assertEqual(process.get_jpeg_size(source), (480, 640))
+        self.assertEqual(process.get_jpeg_orientation(source), 1)
+        self.assertEqual(os.listdir(self.tmp), ["img00000.jpg"])
+
+
+def save_jpeg(path, size, subsampling=2):
+    """Save a patterned JPEG; subsampling 2 (4:2:0) has 16x16 MCUs, 0 has 8x8."""
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    exif = img.getexif()
+    exif[271] = "TestCam"
+    img.save(path, quality=95, subsampling=subsampling, exif=exif)
+
+
+class CanCropLosslesslyTests(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        save_jpeg(self.path("420.jpg"), (200, 160), subsampling=2)
+        save_jpeg(self.path("444.jpg"), (200, 160), subsampling=0)
+
+    def check(self, name, crop_box):
+        with Image.open(self.path(name)) as img:
+            return process._can_crop_losslessly(img, crop_box)
+
+    def test_needs_the_top_left_on_an_mcu_boundary(self):
+        self.assertTrue(self.check("420.jpg", (16, 32, 171, 150)))
+        self.assertFalse(self.check("420.jpg", (8, 32, 171, 150)))
+        self.assertTrue(self.check("444.jpg", (8, 24, 171, 150)))
+        self.assertFalse(self.check("444.jpg", (8, 21, 171, 150)))
+
+    def test_box_must_lie_inside_the_image(self):
+        self.assertFalse(self.check("444.jpg", (0, 0, 201, 160)))
+        self.assertFalse(self.check("444.jpg", (16, 16, 16, 100)))
+
+    def test_only_jpegs(self):
+        Image.new("RGB", (200, 160)).save(self.path("page.png"))
+        self.assertFalse(self.check("page.png", (0, 0, 100, 100)))
+
+
+class LosslessCropTests(TempDirTestCase):
+    @unittest.skipUnless(process.JPEGTRAN, "jpegtran is not installed")
+    def test_crops_the_exact_box_and_keeps_exif(self):
+        source, output = self.path("img00000.jpg"), self.path("out.jpg")
+        save_jpeg(source, (200, 160))
+
+        self.assertTrue(process._lossless_crop(source, (16, 32, 171, 150), output))
+
+        with Image.open(output) as img:
+            self.assertEqual(img.size, (155, 118))
+            self.assertEqual(img.getexif().get(271), "TestCam")
+        self.assertEqual(sorted(os.listdir(self.tmp)), ["img00000.jpg", "out.jpg"])
+
+    def test_reports_missing_jpegtran(self):
+        source, output = self.path("img00000.jpg"), self.path("out.jpg")
+        save_jpeg(source, (200, 160))
+        with mock.patch.object(process, "JPEGTRAN", None):
+            self.assertFalse(process._lossless_crop(source, (16, 32, 171, 150), output))
+        self.assertEqual(os.listdir(self.tmp), ["img00000.jpg"])
+
+    def test_apply_crop_falls_back_to_reencoding(self):
+        source = self.path("img00000.jpg")
+        save_jpeg(source, (200, 160))
+        with mock.patch.object(process, "JPEGTRAN", None):
+            output = process.apply_crop(source, (16, 32, 171, 150))
+        with Image.open(output) as img:
+            self.assertEqual(img.size, (155, 118))
+
+
+class SnapCropBoxTests(TempDirTestCase):
+    def snap(self, subsampling, crop_box):
+        save_jpeg(self.path("page.jpg"), (200, 160), subsampling=subsampling)
+        with Image.open(self.path("page.jpg")) as img:
+            return process._snap_crop_box(img, crop_box)
+
+    def test_moves_top_left_out_to_the_mcu(self):
+        self.assertEqual(self.snap(2, (21, 13, 171, 150)), (16, 0, 171, 150))
+        self.assertEqual(self.snap(0, (21, 13, 171, 150)), (16, 8, 171, 150))
+
+    def test_aligned_box_is_unchanged(self):
+        self.assertEqual(self.snap(2, (32, 16, 171, 150)), (32, 16, 171, 150))
+
+    def test_snapped_apply_crop_covers_the_box(self):
+        source = self.path("img00000.jpg")
+        save_jpeg(source, (200, 160))
+        output = process.apply_crop(source, (21, 13, 171, 150), snap=True)
+        with Image.open(output) as img:
+            self.assertEqual(img.size, (155, 150))
+
+
+class DecodeCropRegionTests(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self.path("img00000.jpg")
+        save_jpeg(self.source, (200, 160))
+
+    def decode(self, crop_box):
+        with Image.open(self.source) as img:
+            return process._decode_crop_region(self.source, img, crop_box)
+
+    @unittest.skipUnless(process.JPEGTRAN, "jpegtran is not installed")
+    def test_matches_a_full_decode_and_crop(self):
+        crop_box = (21, 13, 171, 150)
+        region = self.decode(crop_box)
+        with Image.open(self.source) as img:
+            expected = img.crop(crop_box)
+
+        self.assertEqual(region.size, (150, 137))
+        difference = ImageStat.Stat(ImageChops.difference(region, expected))
+        self.assertLess(max(difference.mean), 2)
+
+    def test_gives_up_without_jpegtran(self):
+        with mock.patch.object(process, "JPEGTRAN", None):
+            self.assertIsNone(self.decode((21, 13, 171, 150)))
+
+    def test_gives_up_on_boxes_outside_the_image(self):
+        self.assertIsNone(self.decode((21, 13, 171, 161)))
+
+
+def exif_jpeg_header(order, entries):
+    """Build the start of a JPEG whose APP1 EXIF has the given IFD0 entries."""
+    ifd = len(entries).to_bytes(2, order)
+    for tag, value in entries:
+        # SHORT (type 3), count 1, value left-justified in the 4-byte field
+        ifd += tag.to_bytes(2, order) + (3).to_bytes(2, order)
+        ifd += (1).to_bytes(4, order) + value.to_bytes(2, order) + b"\0\0"
+    tiff = {"little": b"II*\0", "big": b"MM\0*"}[order]
+    tiff += (8).to_bytes(4, order) + ifd + b"\0\0\0\0"
+    app1 = b"Exif\0\0" + tiff
+    jfif = b"\xff\xe0" + (16).to_bytes(2, "big") + b"JFIF\0\1\1\0\0\1\0\1\0\0"
+    return b"\xff\xd8" + jfif + b"\xff\xe1" + (len(app1) + 2).to_bytes(2, "big") + app1
+
+
+class FindExifOrientationTests(TempDirTestCase):
+    def orientation(self, header):
+        found = process._find_exif_orientation(header)
+        if found is None:
+            return None
+        offset, order = found
+        return int.from_bytes(header[offset : offset + 2], order)
+
+    def test_both_byte_orders(self):
+        for order in ("little", "big"):
+            with self.subTest(order=order):
+                header = exif_jpeg_header(order, [(271, 0), (0x0112, 6)])
+                self.assertEqual(self.orientation(header), 6)
+
+    def test_no_orientation_tag(self):
+        self.assertIsNone(self.orientation(exif_jpeg_header("big", [(271, 0)])))
+        Image.new("RGB", (8, 8)).save(self.path("plain.jpg"))
+        with open(self.path("plain.jpg"), "rb") as f:
+            self.assertIsNone(self.orientation(f.read()))
+
+    def test_not_a_jpeg_or_truncated(self):
+        self.assertIsNone(self.orientation(b"\x89PNG\r\n\x1a\n"))
+        header = exif_jpeg_header("little", [(271, 0), (0x0112, 6)])
+        self.assertIsNone(self.orientation(header[:-10]))
+
+    def test_set_and_get_round_trip(self):
+        source = self.path("img00000.jpg")
+        save_tagged_jpeg(source, (64, 48), orientation=1)
+        self.assertTrue(process.set_jpeg_orientation(source, 8))
+        self.assertEqual(process.get_jpeg_orientation(source), 8)
+        with Image.open(source) as img:
+            self.assertEqual(img.getexif()[process.EXIF_ORIENTATION], 8)
+
+
+class SaveCropSettingsTests(TempDirTestCase):
+    def test_concurrent_saves_publish_whole_files(self):
+        settings = [
+            {"left": i, "top": i, "right": 1000 + i, "bottom": 800 + i, "notes": "x" * i}
+            for i in range(0, 4000, 100)
+        ]
+        with process.ThreadPoolExecutor(max_workers=8) as pool, \
+                contextlib.redirect_stdout(io.StringIO()):
+            list(pool.map(lambda s: process.save_crop_settings(self.tmp, s), settings))
+
+        self.assertIn(process.load_crop_settings(self.tmp), settings)
+        self.assertEqual(os.listdir(self.tmp), ["crop_settings.json"])
+        mode = os.stat(self.path("crop_settings.json")).st_mode & 0o777
+        self.assertEqual(mode, 0o644)
+
+
+if __name__ == "__main__":
+    unittest.main()
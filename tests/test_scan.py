@@ -0,0 +1,419 @@
+"""Tests for scan.py's helpers and web API (run with `python -m unittest discover tests`)."""
+
+import contextlib
+import io
+import os
+import select
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+
+import scan
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def path(self, *names):
+        return os.path.join(self.tmp, *names)
+
+
+class WebApiTestCase(TempDirTestCase):
+    """Runs the Flask app against a captures/ directory in a temp dir."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(scan, "SCRIPT_DIR", self.tmp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = scan.app.test_client()
+
+    def add_capture(self, session, filename, size=(64, 48)):
+        os.makedirs(self.path("captures", session), exist_ok=True)
+        path = self.path("captures", session, filename)
+        Image.new("RGB", size, "white").save(path)
+        return path
+
+
+class ImageMetadataTests(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        scan._read_image_metadata.cache_clear()
+        self.image = self.path("img00000.jpg")
+        Image.new("RGB", (64, 48)).save(self.image)
+
+    def test_unchanged_file_is_read_once(self):
+        with mock.patch.object(
+            scan, "scan_jpeg_header", wraps=scan.scan_jpeg_header
+        ) as scan_header:
+            first = scan.get_image_metadata(self.image)
+            second = scan.get_image_metadata(self.image)
+
+        self.assertEqual(scan_header.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual((first["width"], first["height"]), (64, 48))
+
+    def test_replaced_file_is_read_again(self):
+        scan.get_image_metadata(self.image)
+        # A rotation rewrites the file: new size, new mtime
+        Image.new("RGB", (48, 64)).save(self.image)
+        st = os.stat(self.image)
+        os.utime(self.image, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+        metadata = scan.get_image_metadata(self.image)
+        self.assertEqual((metadata["width"], metadata["height"]), (48, 64))
+
+    def test_callers_get_their_own_copy(self):
+        scan.get_image_metadata(self.image)["width"] = 0
+        self.assertEqual(scan.get_image_metadata(self.image)["width"], 64)
+
+    def test_missing_file(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            metadata = scan.get_image_metadata(self.path("img00001.jpg"))
+        self.assertEqual(metadata["filename"], "img00001.jpg")
+        self.assertEqual(metadata["size"], "N/A")
+        self.assertIsNone(metadata["width"])
+
+
+class ExifFieldsTests(TempDirTestCase):
+    formatted_keys = [key for _, key, _ in scan.EXIF_FIELDS]
+
+    def setUp(self):
+        super().setUp()
+        scan._read_image_metadata.cache_clear()
+
+    def save_with_exif(self, main, exif_ifd):
+        path = self.path("img00000.jpg")
+        img = Image.new("RGB", (64, 48))
+        exif = img.getexif()
+        exif.update(main)
+        exif.get_ifd(scan.EXIF_IFD_POINTER).update(exif_ifd)
+        img.save(path, exif=exif)
+        return path
+
+    def test_formats_main_and_exif_ifd_fields(self):
+        path = self.save_with_exif(
+            {scan.EXIF_MAKE: "Canon ", scan.EXIF_MODEL: "Canon EOS 100D"},
+            {
+                scan.EXIF_ISO: 400,
+                scan.EXIF_EXPOSURE_TIME: IFDRational(1, 125),
+                scan.EXIF_FNUMBER: IFDRational(56, 10),
+                scan.EXIF_FOCAL_LENGTH: IFDRational(35, 1),
+                scan.EXIF_DATETIME_ORIGINAL: "2024:01:02 03:04:05",
+            },
+        )
+        metadata = scan.get_image_metadata(path)
+        self.assertEqual(
+            {key: metadata[key] for key in self.formatted_keys},
+            {
+                "camera_make": "Canon",
+                "camera_model": "Canon EOS 100D",
+                "iso": "ISO 400",
+                "shutter_speed": "1/125s",
+                "aperture": "f/5.6",
+                "focal_length": "35mm",
+                "date_taken": "2024:01:02 03:04:05",
+            },
+        )
+
+    def test_date_taken_prefers_the_original_time(self):
+        path = self.save_with_exif(
+            {scan.EXIF_DATETIME: "2025:06:07 08:09:10"},
+            {scan.EXIF_DATETIME_ORIGINAL: "2024:01:02 03:04:05"},
+        )
+        self.assertEqual(scan.get_image_metadata(path)["date_taken"], "2024:01:02 03:04:05")
+
+    def test_falls_back_to_datetime_and_whole_second_exposures(self):
+        path = self.save_with_exif(
+            {scan.EXIF_DATETIME: "2025:06:07 08:09:10"},
+            {scan.EXIF_EXPOSURE_TIME: IFDRational(2, 1)},
+        )
+        metadata = scan.get_image_metadata(path)
+        self.assertEqual(metadata["date_taken"], "2025:06:07 08:09:10")
+        self.assertEqual(metadata["shutter_speed"], "2s")
+        self.assertIsNone(metadata["iso"])
+
+
+class ListSessionImagesTests(TempDirTestCase):
+    def touch(self, name):
+        open(self.path(name), "wb").close()
+
+    def test_lists_sorted_captures_only(self):
+        for name in ("img00001.jpg", "img00000.jpg", "tmp00002.jpg", "notes.txt"):
+            self.touch(name)
+        self.touch("img00000_crop_preview.png")
+        os.mkdir(self.path("img_dir.jpg"))
+
+        self.assertEqual(
+            scan.list_session_images(self.tmp),
+            [self.path("img00000.jpg"), self.path("img00001.jpg")],
+        )
+
+    def test_listing_is_reused_until_the_directory_changes(self):
+        self.touch("img00000.jpg")
+        first = scan.list_session_images(self.tmp)
+        with mock.patch.object(scan.os, "scandir") as scandir:
+            self.assertIs(scan.list_session_images(self.tmp), first)
+        scandir.assert_not_called()
+
+        self.touch("img00001.jpg")
+        st = os.stat(self.tmp)
+        os.utime(self.tmp, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        self.assertEqual(len(scan.list_session_images(self.tmp)), 2)
+
+
+SUMMARY = """\
+Camera summary:
+Manufacturer: Canon Inc.
+Model: Canon EOS 100D
+  Version: 3-1.0.1
+  Serial Number: 0123456789abcdef0123456789abcdef
+Vendor Extension ID: 0xb (1.0)
+
+Device Capabilities:
+	File Download, File Deletion, File Upload
+Storage Devices Summary:
+store_00020001:
+	Model: not the camera model
+"""
+
+
+class ParseSummaryTests(unittest.TestCase):
+    def test_reads_model_manufacturer_and_serial(self):
+        self.assertEqual(
+            scan.parse_summary(SUMMARY),
+            {
+                "manufacturer": "Canon Inc.",
+                "model": "Canon EOS 100D",
+                "serial": "0123456789abcdef0123456789abcdef",
+            },
+        )
+
+    def test_missing_fields_are_left_out(self):
+        self.assertEqual(
+            scan.parse_summary("Model: Canon EOS 100D\n"), {"model": "Canon EOS 100D"}
+        )
+        self.assertEqual(scan.parse_summary("*** Error: no camera found ***"), {})
+
+
+AUTO_DETECT = """\
+Model                          Port
+----------------------------------------------------------
+Canon EOS 100D                 usb:001,004
+Canon EOS 100D                 usb:001,007
+"""
+
+
+class GetAllCameraSerialsTests(unittest.TestCase):
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(scan.subprocess, "check_output", return_value=AUTO_DETECT),
+            mock.patch.object(
+                scan,
+                "query_single_port_serial",
+                side_effect=lambda port: (port, "serial-" + port[-3:], {"model": "100D"}),
+            ),
+            mock.patch.dict(scan.scanner_state, {"camera_info_map": {}}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_queries_every_port_without_known(self):
+        self.assertEqual(
+            scan.get_all_camera_serials(),
+            {"usb:001,004": "serial-004", "usb:001,007": "serial-007"},
+        )
+        self.assertEqual(scan.query_single_port_serial.call_count, 2)
+
+    def test_only_new_ports_are_queried(self):
+        known = {"usb:001,007": "RIGHT", "usb:001,003": "GONE"}
+        scan.scanner_state["camera_info_map"] = {"usb:001,007": {"model": "old"}}
+
+        serials = scan.get_all_camera_serials(known)
+
+        scan.query_single_port_serial.assert_called_once_with("usb:001,004")
+        # Auto-detect order, and the unplugged camera is dropped
+        self.assertEqual(
+            list(serials.items()),
+            [("usb:001,004", "serial-004"), ("usb:001,007", "RIGHT")],
+        )
+        self.assertEqual(
+            scan.scanner_state["camera_info_map"],
+            {"usb:001,007": {"model": "old"}, "usb:001,004": {"model": "100D"}},
+        )
+
+
+class ConditionalJsonTests(WebApiTestCase):
+    def test_unchanged_listing_answers_304(self):
+        self.add_capture("session-a", "img00000.jpg")
+        first = self.client.get("/api/sessions")
+        etag = first.headers["ETag"]
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["Cache-Control"], "no-cache")
+
+        again = self.client.get("/api/sessions", headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b"")
+
+    def test_changed_listing_is_sent_again(self):
+        self.add_capture("session-a", "img00000.jpg")
+        etag = self.client.get("/api/sessions").headers["ETag"]
+        self.add_capture("session-b", "img00000.jpg")
+
+        response = self.client.get("/api/sessions", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(len(response.get_json()["sessions"]), 2)
+
+
+class ImageExifApiTests(WebApiTestCase):
+    def test_returns_metadata(self):
+        self.add_capture("session", "img00000.jpg")
+        response = self.client.get("/api/image-exif/session/img00000.jpg")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["width"], 64)
+
+    def test_rejects_session_outside_captures(self):
+        Image.new("RGB", (8, 8)).save(self.path("secret.jpg"))
+        for session in ("..", "%2E%2E"):
+            with self.subTest(session=session):
+                response = self.client.get(f"/api/image-exif/{session}/secret.jpg")
+                self.assertEqual(response.status_code, 403)
+
+    def test_missing_image(self):
+        self.add_capture("session", "img00000.jpg")
+        response = self.client.get("/api/image-exif/session/img00001.jpg")
+        self.assertEqual(response.status_code, 404)
+
+
+class ApplyCropApiTests(WebApiTestCase):
+    def apply_crop(self, crop):
+        return self.client.post(
+            "/api/apply-crop", json={"crop": crop, "session": "session"}
+        )
+
+    def test_crops_exactly_like_the_cli(self):
+        self.add_capture("session", "img00000.jpg", size=(200, 160))
+        crop = {"left": 21, "top": 13, "right": 171, "bottom": 150}
+
+        response = self.apply_crop(crop)
+
+        self.assertEqual(response.get_json()["status"], "ok")
+        output = self.path("captures", "session", "cropped", "img00000_cropped.jpg")
+        with Image.open(output) as img:
+            self.assertEqual(img.size, (150, 137))
+
+    def test_reports_failed_images_and_crops_the_rest(self):
+        self.add_capture("session", "img00000.jpg")
+        with open(self.path("captures", "session", "img00001.jpg"), "wb") as f:
+            f.write(b"not a jpeg")
+        self.add_capture("session", "img00002.jpg")
+
+        response = self.apply_crop({"left": 0, "top": 0, "right": 32, "bottom": 32})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["cropped"], 2)
+        self.assertEqual([f["filename"] for f in data["failed"]], ["img00001.jpg"])
+        self.assertIn("img00001.jpg", data["message"])
+        self.assertEqual(
+            sorted(os.listdir(self.path("captures", "session", "cropped"))),
+            ["img00000_cropped.jpg", "img00002_cropped.jpg"],
+        )
+
+
+class GalleryUpdateTests(unittest.TestCase):
+    def setUp(self):
+        for patcher in (
+            mock.patch.dict(
+                scan.scanner_state,
+                {"images": ["img00000.jpg"], "images_set": {"img00000.jpg"}},
+            ),
+            mock.patch.object(scan, "get_image_metadata", lambda f: {"filename": f}),
+            mock.patch.object(scan.socketio, "emit"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def flush(self):
+        scan._gallery_pending["timer"].join()
+
+    def test_burst_is_sent_as_one_append(self):
+        scan.emit_gallery_update(["img00002.jpg"])
+        scan.emit_gallery_update(["img00001.jpg", "img00002.jpg"])
+        self.flush()
+
+        scan.socketio.emit.assert_called_once_with(
+            "gallery_append",
+            {
+                "images": [{"filename": "img00001.jpg"}, {"filename": "img00002.jpg"}],
+                "image_count": 3,
+            },
+        )
+        self.assertEqual(
+            scan.scanner_state["images"],
+            ["img00000.jpg", "img00001.jpg", "img00002.jpg"],
+        )
+
+    def test_recapture_keeps_the_image_count(self):
+        scan.emit_gallery_update(["img00000.jpg"])
+        self.flush()
+
+        _, payload = scan.socketio.emit.call_args.args
+        self.assertEqual(payload["image_count"], 1)
+        self.assertEqual(scan.scanner_state["images"], ["img00000.jpg"])
+
+
+class WaitForInputTests(unittest.TestCase):
+    def setUp(self):
+        # Stands in for the terminal; nothing is ever typed on it
+        stdin_r, stdin_w = os.pipe()
+        self.addCleanup(os.close, stdin_r)
+        self.addCleanup(os.close, stdin_w)
+        patcher = mock.patch.object(sys, "stdin", mock.Mock(fileno=lambda: stdin_r))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_finished_rotations_wake_without_capturing(self):
+        pending = scan.deque()
+        with mock.patch.object(scan, "rotate_jpeg", return_value=True), \
+                mock.patch.object(scan, "emit_gallery_update"):
+            scan.rotate_pair_in_background(pending, "img00000.jpg", "img00001.jpg")
+            scan.finish_rotations(pending, block=True)
+
+        # The pipe is readable, so the loop's blocking select returns...
+        readable, _, _ = select.select([scan.CAPTURE_TRIGGER_R], [], [], 1)
+        self.assertTrue(readable)
+        # ...but only to reap the rotations, not to capture
+        self.assertEqual(scan.wait_for_input(timeout=0), (None, False))
+
+    def test_web_trigger_captures_once(self):
+        os.write(scan.CAPTURE_TRIGGER_W, b"b" + scan.ROTATION_WAKE + b"b")
+        self.assertEqual(scan.wait_for_input(timeout=1), (scan.CAPTURE_KEY, True))
+        self.assertEqual(scan.wait_for_input(timeout=0), (None, False))
+
+
+class WriteCueTests(unittest.TestCase):
+    def test_cue_follows_buffered_text(self):
+        raw = io.BytesIO()
+        stdout = io.TextIOWrapper(raw, encoding="utf-8")
+        with mock.patch.object(sys, "stdout", stdout):
+            print("✓ Saved: img00000.jpg, img00001.jpg")
+            scan.write_cue(scan.READY_CUE)
+        self.assertEqual(
+            raw.getvalue(),
+            "✓ Saved: img00000.jpg, img00001.jpg\n".encode() + b"Ready.\n\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()